@@ -4,9 +4,104 @@
 
 import os
 from pathlib import Path
-from typing import Dict, Any, List
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from types import MappingProxyType
+from typing import Dict, Any, ClassVar, FrozenSet, List, Mapping, Optional, Set, Tuple, Type
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
+
+
+# 默认文件映射 - 基于实际Cosmos SCOPE Job文件结构
+DEFAULT_FILE_MAPPING: Mapping[str, str] = MappingProxyType({
+    # 原始脚本和命令
+    "scope.script": "用户提交的原始SCOPE脚本代码",
+    "NebulaCommandLine.txt": "作业实际提交运行时的命令行参数",
+    
+    # 代码生成相关文件
+    "__ScopeCodeGen__.dll": "编译后的动态链接库，包含作业的实际执行代码",
+    "__ScopeCodeGen__.dll.cs": "生成的C#源代码，包含编译时生成的所有执行逻辑",
+    "__ScopeCodeGenCompileOutput__.txt": "编译阶段生成C#代码时的输出信息",
+    "__ScopeCodeGenCompileOptions__.txt": "编译选项文件，包含编译器使用的具体编译参数",
+    "__CompilerTimers.xml": "编译阶段各个步骤所花费时间的信息",
+    
+    # 作业执行信息文件
+    "JobInfo.xml": "作业的基本信息，如Job ID、提交时间、作业类型、资源需求等",
+    "JobStatistics.xml": "作业执行完成后的统计信息，包括每个阶段执行时长、数据量统计等",
+    "diagnosticsjson": "诊断信息，以JSON格式提供作业执行期间的问题或状态",
+    "Error": "作业执行过程中的错误详细信息",
+    
+    # 数据映射与执行计划文件
+    "Algebra.xml": "以XML格式记录作业执行的查询计划，展现底层算子逻辑与依赖关系",
+    "ScopeVertexDef.xml": "定义作业中的各个计算节点（Vertex）的详细配置信息和参数",
+    "__DataMapDfg__.json": "作业数据流图的JSON表示，提供数据流关系、阶段间的数据依赖关系",
+    
+    # 警告和运行状态信息
+    "__Warnings__.xml": "编译或运行阶段的警告信息，反映可能潜在影响性能的点",
+    "__ScopeRuntimeStatistics__.xml": "作业执行期间运行时的详细统计数据",
+    "__ScopeInternalInfo__.xml": "内部状态信息，用于进一步的故障诊断和分析",
+    "__SStreamInfo__.xml": "Stream流的元数据信息，用于跟踪数据流之间的传输细节",
+    
+    # 性能分析
+    "profile": "作业性能分析数据，可用来深入分析节点级别的资源占用情况"
+})
+
+# 默认解析器映射 - 基于实际Cosmos SCOPE Job文件结构
+DEFAULT_PARSER_MAPPING: Mapping[str, str] = MappingProxyType({
+    # XML文件解析器
+    "JobInfo.xml": "parse_job_info_xml",
+    "JobStatistics.xml": "parse_job_statistics_xml",
+    "Algebra.xml": "parse_algebra_xml",
+    "ScopeVertexDef.xml": "parse_vertex_def_xml",
+    "__CompilerTimers.xml": "parse_compiler_timers_xml",
+    "__Warnings__.xml": "parse_warnings_xml",
+    "__ScopeRuntimeStatistics__.xml": "parse_runtime_statistics_xml",
+    "__ScopeInternalInfo__.xml": "parse_internal_info_xml",
+    "__SStreamInfo__.xml": "parse_stream_info_xml",
+    
+    # JSON文件解析器
+    "__DataMapDfg__.json": "parse_data_flow_graph_json",
+    "diagnosticsjson": "parse_diagnostics_json",
+    
+    # 文本文件解析器
+    "__ScopeCodeGenCompileOutput__.txt": "parse_compile_output_txt",
+    "__ScopeCodeGenCompileOptions__.txt": "parse_compile_options_txt",
+    "NebulaCommandLine.txt": "parse_command_line_txt",
+    
+    # C#代码文件解析器
+    "__ScopeCodeGen__.dll.cs": "parse_csharp_code",
+    
+    # SCOPE脚本解析器
+    "request.script": "parse_scope_script",
+    "scope.script": "parse_scope_script",
+    
+    # 性能分析文件解析器
+    "profile": "parse_profile_data",
+    
+    # 错误文件解析器
+    "Error": "parse_error_file"
+})
+
+# 文件类型优先级设置
+HIGH_PRIORITY_FILES: FrozenSet[str] = frozenset({
+    "scope.script",  # 原始脚本
+    "Error",  # 错误信息
+    "JobStatistics.xml",  # 作业统计
+    "__Warnings__.xml",  # 警告信息
+    "Algebra.xml"  # 执行计划
+})
+
+MEDIUM_PRIORITY_FILES: FrozenSet[str] = frozenset({
+    "JobInfo.xml",
+    "__ScopeRuntimeStatistics__.xml",
+    "__DataMapDfg__.json",
+    "diagnosticsjson"
+})
+
+# 文件大小限制（按文件类型）
+FILE_SIZE_LIMITS: Mapping[str, int] = MappingProxyType({
+    "__ScopeCodeGen__.dll": 50 * 1024 * 1024,  # 50MB
+    "__ScopeCodeGen__.dll.cs": 10 * 1024 * 1024,  # 10MB
+    "profile": 20 * 1024 * 1024,  # 20MB
+    "default": 5 * 1024 * 1024  # 5MB默认限制
+})
 
 
 class ScopeAgentSettings(BaseSettings):
@@ -15,129 +110,76 @@ class ScopeAgentSettings(BaseSettings):
     # 基础设置
     app_name: str = "ScopeAgentV2"
     version: str = "2.0.0"
-    debug: bool = Field(default=False, env="DEBUG")
+    debug: bool = False
     
     # 文件路径设置
-    data_path: str = Field(default="./data", env="DATA_PATH")
-    log_path: str = Field(default="./logs", env="LOG_PATH")
-    knowledge_path: str = Field(default="./data/knowledge", env="KNOWLEDGE_PATH")
+    data_path: str = "./data"
+    log_path: str = "./logs"
+    knowledge_path: str = "./data/knowledge"
     
     # LLM设置
-    llm_provider: str = Field(default="openai", env="LLM_PROVIDER")
-    llm_model: str = Field(default="gpt-4", env="LLM_MODEL")
-    llm_temperature: float = Field(default=0.1, env="LLM_TEMPERATURE")
-    llm_max_tokens: int = Field(default=2000, env="LLM_MAX_TOKENS")
+    llm_provider: str = "openai"
+    llm_model: str = "gpt-4"
+    llm_temperature: float = 0.1
+    llm_max_tokens: int = 2000
     
     # API Keys
-    openai_api_key: str = Field(default="", env="OPENAI_API_KEY")
-    anthropic_api_key: str = Field(default="", env="ANTHROPIC_API_KEY")
+    openai_api_key: str = ""
+    anthropic_api_key: str = ""
     
     # Agent设置
-    max_iterations: int = Field(default=5, env="MAX_ITERATIONS")
-    max_files_per_iteration: int = Field(default=3, env="MAX_FILES_PER_ITERATION")
-    file_size_limit: int = Field(default=10000, env="FILE_SIZE_LIMIT")  # bytes
+    max_iterations: int = 5
+    max_files_per_iteration: int = 3
+    file_size_limit: int = 10000  # bytes
     
     # 分析设置
-    confidence_threshold: float = Field(default=0.7, env="CONFIDENCE_THRESHOLD")
-    relevance_threshold: float = Field(default=0.3, env="RELEVANCE_THRESHOLD")
-    
-    # 文件类型优先级设置
-    high_priority_files: List[str] = [
-        "scope.script",  # 原始脚本
-        "Error",  # 错误信息
-        "JobStatistics.xml",  # 作业统计
-        "__Warnings__.xml",  # 警告信息
-        "Algebra.xml"  # 执行计划
-    ]
-    
-    medium_priority_files: List[str] = [
-        "JobInfo.xml",
-        "__ScopeRuntimeStatistics__.xml", 
-        "__DataMapDfg__.json",
-        "diagnosticsjson"
-    ]
-    
-    # 文件大小限制（按文件类型）
-    file_size_limits: Dict[str, int] = {
-        "__ScopeCodeGen__.dll": 50 * 1024 * 1024,  # 50MB
-        "__ScopeCodeGen__.dll.cs": 10 * 1024 * 1024,  # 10MB
-        "profile": 20 * 1024 * 1024,  # 20MB  
-        "default": 5 * 1024 * 1024  # 5MB默认限制
-    }
+    confidence_threshold: float = 0.7
+    relevance_threshold: float = 0.3
     
-    # 默认文件映射 - 基于实际Cosmos SCOPE Job文件结构
-    default_file_mapping: Dict[str, str] = {
-        # 原始脚本和命令
-        "scope.script": "用户提交的原始SCOPE脚本代码",
-        "NebulaCommandLine.txt": "作业实际提交运行时的命令行参数",
-        
-        # 代码生成相关文件
-        "__ScopeCodeGen__.dll": "编译后的动态链接库，包含作业的实际执行代码",
-        "__ScopeCodeGen__.dll.cs": "生成的C#源代码，包含编译时生成的所有执行逻辑",
-        "__ScopeCodeGenCompileOutput__.txt": "编译阶段生成C#代码时的输出信息",
-        "__ScopeCodeGenCompileOptions__.txt": "编译选项文件，包含编译器使用的具体编译参数",
-        "__CompilerTimers.xml": "编译阶段各个步骤所花费时间的信息",
-        
-        # 作业执行信息文件
-        "JobInfo.xml": "作业的基本信息，如Job ID、提交时间、作业类型、资源需求等",
-        "JobStatistics.xml": "作业执行完成后的统计信息，包括每个阶段执行时长、数据量统计等",
-        "diagnosticsjson": "诊断信息，以JSON格式提供作业执行期间的问题或状态",
-        "Error": "作业执行过程中的错误详细信息",
-        
-        # 数据映射与执行计划文件
-        "Algebra.xml": "以XML格式记录作业执行的查询计划，展现底层算子逻辑与依赖关系",
-        "ScopeVertexDef.xml": "定义作业中的各个计算节点（Vertex）的详细配置信息和参数",
-        "__DataMapDfg__.json": "作业数据流图的JSON表示，提供数据流关系、阶段间的数据依赖关系",
-        
-        # 警告和运行状态信息
-        "__Warnings__.xml": "编译或运行阶段的警告信息，反映可能潜在影响性能的点",
-        "__ScopeRuntimeStatistics__.xml": "作业执行期间运行时的详细统计数据",
-        "__ScopeInternalInfo__.xml": "内部状态信息，用于进一步的故障诊断和分析",
-        "__SStreamInfo__.xml": "Stream流的元数据信息，用于跟踪数据流之间的传输细节",
-        
-        # 性能分析
-        "profile": "作业性能分析数据，可用来深入分析节点级别的资源占用情况"
-    }
+    # 字段名即环境变量名（不区分大小写）
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore"  # 忽略额外的环境变量
+    )
     
-    # 默认解析器映射 - 基于实际Cosmos SCOPE Job文件结构
-    default_parser_mapping: Dict[str, str] = {
-        # XML文件解析器
-        "JobInfo.xml": "parse_job_info_xml",
-        "JobStatistics.xml": "parse_job_statistics_xml",
-        "Algebra.xml": "parse_algebra_xml",
-        "ScopeVertexDef.xml": "parse_vertex_def_xml",
-        "__CompilerTimers.xml": "parse_compiler_timers_xml",
-        "__Warnings__.xml": "parse_warnings_xml",
-        "__ScopeRuntimeStatistics__.xml": "parse_runtime_statistics_xml",
-        "__ScopeInternalInfo__.xml": "parse_internal_info_xml",
-        "__SStreamInfo__.xml": "parse_stream_info_xml",
-        
-        # JSON文件解析器
-        "__DataMapDfg__.json": "parse_data_flow_graph_json",
-        "diagnosticsjson": "parse_diagnostics_json",
-        
-        # 文本文件解析器
-        "__ScopeCodeGenCompileOutput__.txt": "parse_compile_output_txt",
-        "__ScopeCodeGenCompileOptions__.txt": "parse_compile_options_txt",
-        "NebulaCommandLine.txt": "parse_command_line_txt",
-        
-        # C#代码文件解析器
-        "__ScopeCodeGen__.dll.cs": "parse_csharp_code",
-        
-        # SCOPE脚本解析器
-        "scope.script": "parse_scope_script",
-        
-        # 性能分析文件解析器
-        "profile": "parse_profile_data",
-        
-        # 错误文件解析器
-        "Error": "parse_error_file"
-    }
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """配置来源：初始化参数、环境变量和.env文件（不使用secrets目录）"""
+        return init_settings, env_settings, dotenv_settings
+    
+    # 以下常量为模块级只读数据，不作为模型字段参与校验和拷贝
+    @property
+    def high_priority_files(self) -> FrozenSet[str]:
+        """高优先级文件"""
+        return HIGH_PRIORITY_FILES
+    
+    @property
+    def medium_priority_files(self) -> FrozenSet[str]:
+        """中优先级文件"""
+        return MEDIUM_PRIORITY_FILES
+    
+    @property
+    def file_size_limits(self) -> Mapping[str, int]:
+        """按文件类型的文件大小限制"""
+        return FILE_SIZE_LIMITS
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"  # 忽略额外的环境变量
+    @property
+    def default_file_mapping(self) -> Mapping[str, str]:
+        """默认文件映射"""
+        return DEFAULT_FILE_MAPPING
+    
+    @property
+    def default_parser_mapping(self) -> Mapping[str, str]:
+        """默认解析器映射"""
+        return DEFAULT_PARSER_MAPPING
     
     def get_data_path(self) -> Path:
         """获取数据路径"""
@@ -151,10 +193,22 @@ class ScopeAgentSettings(BaseSettings):
         """获取知识库路径"""
         return Path(self.knowledge_path)
     
+    # 已确认存在的目录，避免重复的 stat/mkdir 系统调用
+    _ensured_dirs: ClassVar[Set[Path]] = set()
+    
     def ensure_directories(self):
         """确保所需目录存在"""
-        for path in [self.get_data_path(), self.get_log_path(), self.get_knowledge_path()]:
-            path.mkdir(parents=True, exist_ok=True)
+        paths = [self.get_data_path(), self.get_log_path(), self.get_knowledge_path()]
+        for path in paths:
+            if path in self._ensured_dirs:
+                continue
+            # 子目录创建时会连带创建父目录（如 data/knowledge 位于 data 下）
+            if any(path in other.parents for other in paths):
+                continue
+            if not path.exists():
+                path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+            self._ensured_dirs.update(p for p in paths if p in path.parents)
 
 
 class LLMConfig:
@@ -179,19 +233,40 @@ class LLMConfig:
         }
     }
     
+    # 预先计算的查找表，模型列表以元组返回避免调用方修改配置
+    _MODELS_BY_PROVIDER: Dict[str, Tuple[str, ...]] = {
+        provider: tuple(info["models"]) for provider, info in SUPPORTED_PROVIDERS.items()
+    }
+    _DEFAULT_MODEL_BY_PROVIDER: Dict[str, str] = {
+        provider: info["default_model"] for provider, info in SUPPORTED_PROVIDERS.items()
+    }
+    
     @classmethod
-    def get_supported_models(cls, provider: str) -> List[str]:
+    def get_supported_models(cls, provider: str) -> Tuple[str, ...]:
         """获取支持的模型列表"""
-        return cls.SUPPORTED_PROVIDERS.get(provider, {}).get("models", [])
+        return cls._MODELS_BY_PROVIDER.get(provider, ())
     
     @classmethod
     def get_default_model(cls, provider: str) -> str:
         """获取默认模型"""
-        return cls.SUPPORTED_PROVIDERS.get(provider, {}).get("default_model", "")
+        return cls._DEFAULT_MODEL_BY_PROVIDER.get(provider, "")
+
+
+# 全局设置实例（首次访问时创建）
+_settings: Optional[ScopeAgentSettings] = None
+
 
+def get_settings() -> ScopeAgentSettings:
+    """获取全局设置实例，首次调用时构建并确保目录存在"""
+    global _settings
+    if _settings is None:
+        _settings = ScopeAgentSettings()
+        _settings.ensure_directories()
+    return _settings
 
-# 全局设置实例
-settings = ScopeAgentSettings()
 
-# 确保目录存在
-settings.ensure_directories() 
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    """兼容旧的 `from config.settings import settings` 用法"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,22 +5,48 @@ ScopeAgentV2 主程序入口
 import os
 import sys
 from pathlib import Path
+from typing import Dict
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from langchain_openai import ChatOpenAI
-from src import ScopeThinkAgent
-from src.tools.file_reader import FileReaderTool
-from src.tools.file_recommendation import FileRecommendationTool, DEFAULT_FILE_MAPPING, DEFAULT_PARSER_MAPPING
 from src.models.analysis_models import ScopeFileType
-from config.settings import settings
+from config.settings import get_settings, DEFAULT_FILE_MAPPING, DEFAULT_PARSER_MAPPING, HIGH_PRIORITY_FILES
+
+
+# Job目录中可分析的文件名到文件类型的映射
+FILE_NAME_TO_TYPE: Dict[str, ScopeFileType] = {
+    "request.script": ScopeFileType.SCOPE_SCRIPT,
+    "scope.script": ScopeFileType.SCOPE_SCRIPT,
+    "NebulaCommandLine.txt": ScopeFileType.COMMAND_LINE,
+    "JobInfo.xml": ScopeFileType.JOB_INFO,
+    "JobStatistics.xml": ScopeFileType.JOB_STATISTICS,
+    "JobAnalysisResult.xml": ScopeFileType.JOB_STATISTICS,  # 使用相同解析器
+    "ScopeVertexDef.xml": ScopeFileType.VERTEX_DEF,
+    "__DataMapDfg__.json": ScopeFileType.DATA_FLOW_GRAPH,
+    "__Warnings__.xml": ScopeFileType.WARNINGS,
+    "__CompilerTimers.xml": ScopeFileType.COMPILER_TIMERS,
+    "__ScopeCodeGenCompileOutput__.txt": ScopeFileType.COMPILE_OUTPUT,
+    "__SStreamInfo__.xml": ScopeFileType.STREAM_INFO,
+    "diagnosticsjson": ScopeFileType.DIAGNOSTICS,
+    "profile": ScopeFileType.PROFILE,
+    "Error": ScopeFileType.ERROR_LOG
+}
+
+
+def _format_size(size: int) -> str:
+    """格式化文件大小"""
+    if size > 1024*1024:
+        return f"{size/(1024*1024):.1f}MB"
+    elif size > 1024:
+        return f"{size/1024:.1f}KB"
+    return f"{size}B"
 
 
 def scan_scope_jobs():
     """扫描并返回可用的SCOPE Job目录"""
-    jobs_path = settings.get_data_path() / "scope_jobs"
+    jobs_path = get_settings().get_data_path() / "scope_jobs"
     
     if not jobs_path.exists():
         print(f"SCOPE Jobs目录不存在: {jobs_path}")
@@ -38,51 +64,29 @@ def analyze_job_structure(job_path):
     """分析Job目录结构，识别可用的文件"""
     available_files = {}
     
-    # 检查我们配置的文件类型
-    file_mappings = {
-        # 使用实际文件名映射到我们的配置
-        "request.script": ScopeFileType.SCOPE_SCRIPT,
-        "scope.script": ScopeFileType.SCOPE_SCRIPT,
-        "NebulaCommandLine.txt": ScopeFileType.COMMAND_LINE,
-        "JobInfo.xml": ScopeFileType.JOB_INFO,
-        "JobStatistics.xml": ScopeFileType.JOB_STATISTICS,
-        "JobAnalysisResult.xml": ScopeFileType.JOB_STATISTICS,  # 使用相同解析器
-        "ScopeVertexDef.xml": ScopeFileType.VERTEX_DEF,
-        "__DataMapDfg__.json": ScopeFileType.DATA_FLOW_GRAPH,
-        "__Warnings__.xml": ScopeFileType.WARNINGS,
-        "__CompilerTimers.xml": ScopeFileType.COMPILER_TIMERS,
-        "__ScopeCodeGenCompileOutput__.txt": ScopeFileType.COMPILE_OUTPUT,
-        "__SStreamInfo__.xml": ScopeFileType.STREAM_INFO,
-        "diagnosticsjson": ScopeFileType.DIAGNOSTICS,
-        "profile": ScopeFileType.PROFILE,
-        "Error": ScopeFileType.ERROR_LOG
-    }
-    
     print(f"\n=== 分析Job目录: {job_path.name} ===")
     
-    for file_path in job_path.iterdir():
-        if file_path.is_file():
-            file_name = file_path.name
-            if file_name in file_mappings:
-                file_type = file_mappings[file_name]
-                available_files[file_name] = {
-                    'path': file_path,
-                    'type': file_type,
-                    'size': file_path.stat().st_size
-                }
-                
-                # 格式化文件大小
-                size = file_path.stat().st_size
-                if size > 1024*1024:
-                    size_str = f"{size/(1024*1024):.1f}MB"
-                elif size > 1024:
-                    size_str = f"{size/1024:.1f}KB"
-                else:
-                    size_str = f"{size}B"
-                    
-                print(f"  ✓ {file_name} ({size_str})")
+    # 使用scandir复用目录项缓存的文件类型，每个文件只stat一次
+    with os.scandir(job_path) as entries:
+        for entry in entries:
+            file_name = entry.name
+            if file_name not in FILE_NAME_TO_TYPE or not entry.is_file():
+                continue
+            
+            size = entry.stat().st_size
+            available_files[file_name] = {
+                'path': Path(entry.path),
+                'type': FILE_NAME_TO_TYPE[file_name],
+                'size': size
+            }
+            
+            print(f"  ✓ {file_name} ({_format_size(size)})")
     
     print(f"共发现 {len(available_files)} 个可分析文件")
+    
+    priority_files = HIGH_PRIORITY_FILES & available_files.keys()
+    if priority_files:
+        print(f"其中高优先级文件: {', '.join(sorted(priority_files))}")
     return available_files
 
 
@@ -119,6 +123,7 @@ def select_job():
 
 def main():
     """主函数"""
+    settings = get_settings()
     print("=== ScopeAgentV2 启动 ===")
     print(f"版本: {settings.version}")
     print(f"数据路径: {settings.get_data_path()}")
@@ -135,6 +140,12 @@ def main():
         print("该Job目录中没有可分析的文件")
         return
     
+    # 文件列表在整个会话中不变，预先生成供 'files' 命令使用
+    files_listing = "\n".join(
+        f"  ✓ {file_name} ({_format_size(info['size'])}) - {info['type'].value}"
+        for file_name, info in available_files.items()
+    )
+    
     # 初始化LLM（这里使用OpenAI作为示例）
     # 注意：需要设置OPENAI_API_KEY环境变量
     if not settings.openai_api_key:
@@ -145,6 +156,12 @@ def main():
         print("LLM_MODEL=gpt-4")
         return
     
+    # LangChain及Agent相关模块导入开销较大，仅在确认可以运行分析后再导入
+    from langchain_openai import ChatOpenAI
+    from src import ScopeThinkAgent
+    from src.tools.file_reader import FileReaderTool
+    from src.tools.file_recommendation import FileRecommendationTool
+    
     try:
         llm = ChatOpenAI(
             api_key=settings.openai_api_key,
@@ -156,12 +173,12 @@ def main():
         # 初始化工具 - 使用选中的Job目录
         file_reader = FileReaderTool(
             base_path=str(selected_job),
-            parser_mapping=settings.default_parser_mapping
+            parser_mapping=DEFAULT_PARSER_MAPPING
         )
         
         recommendation_tool = FileRecommendationTool(
-            file_content_mapping=settings.default_file_mapping,
-            parser_functions=settings.default_parser_mapping
+            file_content_mapping=DEFAULT_FILE_MAPPING,
+            parser_functions=DEFAULT_PARSER_MAPPING
         )
         
         # 初始化Agent
@@ -190,10 +207,7 @@ def main():
                     print("再见！")
                     break
                 elif user_input.lower() == 'files':
-                    print("\n可用文件:")
-                    for file_name, info in available_files.items():
-                        size_str = f"{info['size']/(1024*1024):.1f}MB" if info['size'] > 1024*1024 else f"{info['size']/1024:.1f}KB"
-                        print(f"  ✓ {file_name} ({size_str}) - {info['type'].value}")
+                    print("\n可用文件:\n" + files_listing)
                     continue
                 elif user_input.lower() == 'demo':
                     # 运行演示问题
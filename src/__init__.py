@@ -8,9 +8,27 @@ ScopeAgentV2 - AI 作业优化 Agent
 __version__ = "2.0.0"
 __author__ = "ScopeAgent Team"
 
-from .agents import ScopeThinkAgent
-from .tools import FileReaderTool, FileRecommendationTool
-from .chains import ScopeAnalysisChain
+import importlib
+from typing import Any
+
+# 导出名称 -> 所在子模块；这些模块依赖LangChain，首次访问时才导入
+_LAZY_EXPORTS = {
+    "ScopeThinkAgent": ".agents",
+    "FileReaderTool": ".tools",
+    "FileRecommendationTool": ".tools",
+    "ScopeAnalysisChain": ".chains"
+}
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入导出的类，只使用数据模型等子模块时无需加载LangChain"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "ScopeThinkAgent",
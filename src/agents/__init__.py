@@ -2,7 +2,24 @@
 Agent模块 - 核心推理逻辑
 """
 
-from .scope_think_agent import ScopeThinkAgent
-from .base_agent import BaseThinkAgent
+import importlib
+from typing import Any
+
+# 导出名称 -> 所在子模块；这些模块依赖LangChain，首次访问时才导入
+_LAZY_EXPORTS = {
+    "ScopeThinkAgent": ".scope_think_agent",
+    "BaseThinkAgent": ".base_agent"
+}
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入Agent类"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = ["ScopeThinkAgent", "BaseThinkAgent"] 
\ No newline at end of file
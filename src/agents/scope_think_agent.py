@@ -2,6 +2,8 @@
 ScopeThinkAgent - 核心分析Agent
 """
 
+import logging
+import re
 import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -19,6 +21,39 @@ from ..tools.iterative_feedback import IterativeFeedbackProcessor
 from .base_agent import BaseThinkAgent
 
 
+logger = logging.getLogger(__name__)
+
+# THINK步骤标记
+_THINK_STEP_HEADERS = {
+    ThinkStep.PROBLEM_CLASSIFICATION: "[THINK 1]",
+    ThinkStep.CODE_ANALYSIS: "[THINK 2]", 
+    ThinkStep.EXPERIENCE_ANALYSIS: "[THINK 3]",
+    ThinkStep.INFO_COMPLETENESS: "[THINK 4]",
+    ThinkStep.FINAL_SOLUTION: "[THINK 5]"
+}
+_THINK_STEP_BY_NUMBER = {
+    header[len("[THINK "):-1]: step for step, header in _THINK_STEP_HEADERS.items()
+}
+_THINK_HEADER_RE = re.compile(r'\[THINK ([1-5])\]')
+
+# 追加到分析内容中的文件内容分隔标记
+_FILES_CONTENT_MARKER = "\n\n=== 文件内容 ==="
+
+# 通用优化经验（简化实现，尚未接入知识库）
+_BASE_EXPERIENCE = """
+        [数据倾斜优化经验]
+        1. 使用PartitionBy合理重新分区
+        2. 热点键单独处理或加随机盐值
+        3. 避免过度集中的Join键
+        
+        [Shuffle优化经验]
+        1. 合理利用PartitionBy减少重复Shuffle
+        2. 提前投影减少数据规模
+        3. 避免多次全网重分布
+        4. 使用广播Join处理小表
+        """
+
+
 class ScopeThinkAgent(BaseThinkAgent):
     """SCOPE作业分析的智能Agent"""
     
@@ -85,15 +120,18 @@ class ScopeThinkAgent(BaseThinkAgent):
             if not context.files_read:
                 print("\n📄 自动读取关键文件...")
                 initial_files = self._get_initial_files_to_read()
+                # 先收集各文件内容，最后一次性拼接，避免反复复制不断增长的字符串
+                initial_sections = []
                 for file_name in initial_files:
                     try:
                         file_content = self.file_reader.read_single_file(file_name)
                         context.files_read.append(file_name)
-                        context.current_analysis += f"\n\n=== {file_name} 内容 ===\n{file_content}"
+                        initial_sections.append(f"\n\n=== {file_name} 内容 ===\n{file_content}")
                         files_analyzed.append(file_name)
                         print(f"   ✅ 读取 {file_name}")
                     except Exception as e:
                         print(f"   ❌ 无法读取 {file_name}: {str(e)}")
+                context.current_analysis += "".join(initial_sections)
             
             # 迭代分析过程
             while iteration_state.can_continue():
@@ -108,9 +146,9 @@ class ScopeThinkAgent(BaseThinkAgent):
                 result = self.analysis_chain.invoke(analysis_input)
                 
                 # 调试输出
-                print(f"\n🔍 调试信息:")
-                print(f"LLM返回类型: {type(result)}")
-                print(f"LLM返回键: {list(result.keys()) if isinstance(result, dict) else 'N/A'}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("LLM返回类型: %s", type(result))
+                    logger.debug("LLM返回键: %s", list(result.keys()) if isinstance(result, dict) else 'N/A')
                 
                 # 尝试不同的解析方式
                 if isinstance(result, dict):
@@ -124,9 +162,9 @@ class ScopeThinkAgent(BaseThinkAgent):
                 else:
                     response = str(result)
                 
-                print(f"解析后响应长度: {len(response)}")
-                print(f"响应前100字符: {response[:100]}...")
-                print("="*50)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("解析后响应长度: %d", len(response))
+                    logger.debug("响应前100字符: %s...", response[:100])
                 
                 # 解析分析结果
                 step_results = self._parse_think_steps(response)
@@ -147,7 +185,11 @@ class ScopeThinkAgent(BaseThinkAgent):
                     if read_result["success"]:
                         files_analyzed.extend(read_result["files_read"])
                         context.files_read.extend(read_result["files_read"])
-                        context.current_analysis += f"\n\n=== 文件内容 ===\n{read_result['content']}"
+                        # 记录文件内容的起始位置，供构造下一轮输入时直接截取
+                        context.files_content_start = (
+                            len(context.current_analysis) + len(_FILES_CONTENT_MARKER)
+                        )
+                        context.current_analysis += f"{_FILES_CONTENT_MARKER}\n{read_result['content']}"
                     else:
                         # 如果无法读取更多文件，则停止迭代
                         iteration_state.information_sufficient = True
@@ -213,69 +255,43 @@ class ScopeThinkAgent(BaseThinkAgent):
     def _get_relevant_experience(self, question: str, context: ContextInfo) -> str:
         """获取相关经验知识（简化实现）"""
         # 这里可以接入RAG系统或知识库
-        base_experience = """
-        [数据倾斜优化经验]
-        1. 使用PartitionBy合理重新分区
-        2. 热点键单独处理或加随机盐值
-        3. 避免过度集中的Join键
-        
-        [Shuffle优化经验]
-        1. 合理利用PartitionBy减少重复Shuffle
-        2. 提前投影减少数据规模
-        3. 避免多次全网重分布
-        4. 使用广播Join处理小表
-        """
-        return base_experience
+        return _BASE_EXPERIENCE
     
     def _format_files_content(self, context: ContextInfo) -> str:
         """格式化文件内容"""
-        if not context.current_analysis:
+        if not context.current_analysis or context.files_content_start is None:
             return "暂无文件内容"
         
-        # 提取文件相关部分
-        parts = context.current_analysis.split("=== 文件内容 ===")
-        if len(parts) > 1:
-            return parts[-1]
-        return "暂无文件内容"
+        # 按记录的位置截取最近一段文件内容（含其后的分析），无需查找分隔符
+        return context.current_analysis[context.files_content_start:]
     
     def _parse_think_steps(self, response: str) -> List[ThinkStepResult]:
         """解析思考步骤结果"""
         steps = []
         
-        # 修复：使用正确的THINK步骤格式
-        think_patterns = {
-            ThinkStep.PROBLEM_CLASSIFICATION: "[THINK 1]",
-            ThinkStep.CODE_ANALYSIS: "[THINK 2]", 
-            ThinkStep.EXPERIENCE_ANALYSIS: "[THINK 3]",
-            ThinkStep.INFO_COMPLETENESS: "[THINK 4]",
-            ThinkStep.FINAL_SOLUTION: "[THINK 5]"
-        }
+        logger.debug("解析THINK步骤, 响应长度: %d", len(response))
         
-        print(f"\n🔍 解析THINK步骤...")
-        print(f"响应长度: {len(response)}")
+        # 一次扫描记录每个THINK步骤标记首次出现的位置
+        first_positions = {}
+        for match in _THINK_HEADER_RE.finditer(response):
+            first_positions.setdefault(_THINK_STEP_BY_NUMBER[match.group(1)], match.start())
         
-        for step, pattern in think_patterns.items():
-            if pattern in response:
-                print(f"✅ 找到 {pattern}")
+        # 按位置排序后，下一个步骤的开始即为当前步骤内容的结束
+        ordered_starts = sorted(first_positions.values())
+        next_step_starts = dict(zip(ordered_starts, ordered_starts[1:] + [len(response)]))
+        
+        for step, pattern in _THINK_STEP_HEADERS.items():
+            start_idx = first_positions.get(step)
+            if start_idx is not None:
+                logger.debug("找到 %s", pattern)
                 
                 # 提取该步骤的内容
-                start_idx = response.find(pattern)
-                
-                # 寻找下一个步骤的开始
-                next_step_idx = len(response)
-                for other_step, other_pattern in think_patterns.items():
-                    if other_step != step and other_pattern in response:
-                        other_idx = response.find(other_pattern)
-                        if other_idx > start_idx and other_idx < next_step_idx:
-                            next_step_idx = other_idx
-                
-                content = response[start_idx:next_step_idx].strip()
+                content = response[start_idx:next_step_starts[start_idx]].strip()
                 
                 # 检查是否需要更多信息
                 needs_more_info = ("需要文件" in content and "是" in content) or "【需要文件】: 是" in content
                 
-                print(f"   内容长度: {len(content)}")
-                print(f"   需要更多信息: {needs_more_info}")
+                logger.debug("%s 内容长度: %d, 需要更多信息: %s", pattern, len(content), needs_more_info)
                 
                 step_result = ThinkStepResult(
                     step=step,
@@ -286,9 +302,9 @@ class ScopeThinkAgent(BaseThinkAgent):
                 
                 steps.append(step_result)
             else:
-                print(f"❌ 未找到 {pattern}")
+                logger.debug("未找到 %s", pattern)
         
-        print(f"总共解析到 {len(steps)} 个步骤")
+        logger.debug("总共解析到 %d 个步骤", len(steps))
         return steps
     
     def _smart_read_files(self, context: ContextInfo, iteration_state: IterationState,
@@ -3,19 +3,19 @@
 """
 
 from enum import Enum
-from typing import List, Dict, Optional, Any, Union
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
-class ProblemType(Enum):
+class ProblemType(str, Enum):
     """问题类型枚举"""
     DATA_SKEW = "数据倾斜"
     EXCESSIVE_SHUFFLE = "过多Shuffle"
     OTHER = "其他"
 
 
-class ThinkStep(Enum):
+class ThinkStep(str, Enum):
     """思考步骤枚举"""
     PROBLEM_CLASSIFICATION = "THINK_1"  # 问题分类
     CODE_ANALYSIS = "THINK_2"           # 关键代码分析
@@ -24,7 +24,7 @@ class ThinkStep(Enum):
     FINAL_SOLUTION = "THINK_5"          # 最终方案建议
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FileRecommendation:
     """文件推荐信息"""
     file_name: str
@@ -35,37 +35,28 @@ class FileRecommendation:
     parser_function: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextInfo:
     """上下文信息"""
     problem_type: Optional[ProblemType] = None
     user_input: str = ""
     current_analysis: str = ""
-    files_read: List[str] = None
-    key_findings: List[str] = None
-    
-    def __post_init__(self):
-        if self.files_read is None:
-            self.files_read = []
-        if self.key_findings is None:
-            self.key_findings = []
+    files_read: List[str] = field(default_factory=list)
+    key_findings: List[str] = field(default_factory=list)
+    files_content_start: Optional[int] = None  # 最近一段文件内容在current_analysis中的起始位置
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkStepResult:
     """单个思考步骤的结果"""
     step: ThinkStep
     content: str
     confidence: float = 0.0
     needs_more_info: bool = False
-    recommended_files: List[FileRecommendation] = None
-    
-    def __post_init__(self):
-        if self.recommended_files is None:
-            self.recommended_files = []
+    recommended_files: Tuple[FileRecommendation, ...] = ()
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """完整分析结果"""
     problem_type: ProblemType
@@ -75,22 +66,29 @@ class AnalysisResult:
     files_analyzed: List[str]
     processing_time: float
     timestamp: datetime
+    _step_index: Optional[Dict[ThinkStep, ThinkStepResult]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _get_step_index(self) -> Dict[ThinkStep, ThinkStepResult]:
+        """获取步骤索引（首次访问时根据think_steps构建）"""
+        if self._step_index is None:
+            index = {}
+            for result in self.think_steps:
+                index.setdefault(result.step, result)
+            self._step_index = index
+        return self._step_index
     
     def get_step_result(self, step: ThinkStep) -> Optional[ThinkStepResult]:
         """获取特定步骤的结果"""
-        for result in self.think_steps:
-            if result.step == step:
-                return result
-        return None
+        return self._get_step_index().get(step)
     
     def is_analysis_complete(self) -> bool:
         """检查分析是否完整"""
-        required_steps = list(ThinkStep)
-        completed_steps = [result.step for result in self.think_steps]
-        return all(step in completed_steps for step in required_steps)
+        return self._get_step_index().keys() >= set(ThinkStep)
 
 
-@dataclass
+@dataclass(slots=True)
 class IterationState:
     """迭代状态信息"""
     iteration_count: int = 0
@@ -109,7 +107,7 @@ class IterationState:
         self.iteration_count += 1
 
 
-@dataclass
+@dataclass(slots=True)
 class FileAnalysisInfo:
     """文件分析信息"""
     file_name: str
@@ -117,14 +115,10 @@ class FileAnalysisInfo:
     content_summary: str
     file_type: str
     analysis_timestamp: datetime
-    key_insights: List[str] = None
-    
-    def __post_init__(self):
-        if self.key_insights is None:
-            self.key_insights = []
+    key_insights: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperienceKnowledge:
     """经验知识条目"""
     problem_type: ProblemType
@@ -132,11 +126,7 @@ class ExperienceKnowledge:
     description: str
     solution_pattern: str
     confidence: float
-    examples: List[str] = None
-    
-    def __post_init__(self):
-        if self.examples is None:
-            self.examples = []
+    examples: List[str] = field(default_factory=list)
 
 
 # === Cosmos SCOPE Job 特定的数据模型 ===
@@ -184,7 +174,7 @@ class FileAnalysisStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(slots=True)
 class ScopeJobInfo:
     """SCOPE 作业基本信息"""
     job_id: str
@@ -192,23 +182,13 @@ class ScopeJobInfo:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     status: str = ""
-    resource_requirements: Dict[str, Any] = None
-    input_tables: List[Dict[str, Any]] = None
-    output_tables: List[Dict[str, Any]] = None
-    parameters: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.resource_requirements is None:
-            self.resource_requirements = {}
-        if self.input_tables is None:
-            self.input_tables = []
-        if self.output_tables is None:
-            self.output_tables = []
-        if self.parameters is None:
-            self.parameters = {}
-
-
-@dataclass
+    resource_requirements: Dict[str, Any] = field(default_factory=dict)
+    input_tables: List[Dict[str, Any]] = field(default_factory=list)
+    output_tables: List[Dict[str, Any]] = field(default_factory=list)
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
 class StageInfo:
     """Stage 执行信息"""
     stage_id: str
@@ -218,17 +198,11 @@ class StageInfo:
     data_processed: str = ""
     data_output: str = ""
     status: str = ""
-    warnings: List[str] = None
-    skewed_tasks: List[Dict[str, Any]] = None
-    
-    def __post_init__(self):
-        if self.warnings is None:
-            self.warnings = []
-        if self.skewed_tasks is None:
-            self.skewed_tasks = []
+    warnings: List[str] = field(default_factory=list)
+    skewed_tasks: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetric:
     """性能指标"""
     name: str
@@ -239,7 +213,7 @@ class PerformanceMetric:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ScopeJobStatistics:
     """SCOPE 作业统计信息"""
     job_id: str
@@ -249,102 +223,130 @@ class ScopeJobStatistics:
     tasks_completed: int
     tasks_failed: int = 0
     retry_count: int = 0
-    stages: List[StageInfo] = None
-    performance_metrics: List[PerformanceMetric] = None
+    stages: List[StageInfo] = field(default_factory=list)
+    performance_metrics: List[PerformanceMetric] = field(default_factory=list)
+    _stage_index: Optional[Dict[str, StageInfo]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _stage_index_size: int = field(default=0, init=False, repr=False, compare=False)
+    _metric_index: Optional[Dict[str, PerformanceMetric]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _metric_index_size: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def _get_stage_index(self) -> Dict[str, StageInfo]:
+        """获取stage索引（首次访问或stages被直接修改后重新构建）"""
+        index = self._stage_index
+        if index is None or self._stage_index_size != len(self.stages):
+            index = {}
+            for stage in self.stages:
+                index.setdefault(stage.stage_id, stage)
+            self._stage_index = index
+            self._stage_index_size = len(self.stages)
+        return index
     
-    def __post_init__(self):
-        if self.stages is None:
-            self.stages = []
-        if self.performance_metrics is None:
-            self.performance_metrics = []
+    def add_stage(self, stage: StageInfo):
+        """添加stage信息并同步更新索引"""
+        index = self._get_stage_index()
+        self.stages.append(stage)
+        index.setdefault(stage.stage_id, stage)
+        self._stage_index_size = len(self.stages)
     
     def get_stage_by_id(self, stage_id: str) -> Optional[StageInfo]:
         """根据 stage_id 获取 stage 信息"""
-        for stage in self.stages:
-            if stage.stage_id == stage_id:
-                return stage
-        return None
+        return self._get_stage_index().get(stage_id)
+    
+    def _get_metric_index(self) -> Dict[str, PerformanceMetric]:
+        """获取性能指标索引（首次访问或performance_metrics被直接修改后重新构建）"""
+        index = self._metric_index
+        if index is None or self._metric_index_size != len(self.performance_metrics):
+            index = {}
+            for metric in self.performance_metrics:
+                index.setdefault(metric.name, metric)
+            self._metric_index = index
+            self._metric_index_size = len(self.performance_metrics)
+        return index
+    
+    def add_metric(self, metric: PerformanceMetric):
+        """添加性能指标并同步更新索引"""
+        index = self._get_metric_index()
+        self.performance_metrics.append(metric)
+        index.setdefault(metric.name, metric)
+        self._metric_index_size = len(self.performance_metrics)
     
     def get_skew_ratio(self) -> Optional[float]:
         """获取数据倾斜比率"""
-        for metric in self.performance_metrics:
-            if metric.name == "SkewRatio":
-                return float(metric.value) if isinstance(metric.value, (str, int, float)) else None
-        return None
+        metric = self._get_metric_index().get("SkewRatio")
+        if metric is None:
+            return None
+        return float(metric.value) if isinstance(metric.value, (str, int, float)) else None
 
 
-@dataclass
+@dataclass(slots=True)
 class CompilerInfo:
     """编译器信息"""
-    compile_options: Dict[str, Any] = None
+    compile_options: Dict[str, Any] = field(default_factory=dict)
     compile_output: str = ""
-    timers: Dict[str, Any] = None
-    warnings: List[str] = None
-    
-    def __post_init__(self):
-        if self.compile_options is None:
-            self.compile_options = {}
-        if self.timers is None:
-            self.timers = {}
-        if self.warnings is None:
-            self.warnings = []
+    timers: Dict[str, Any] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFlowGraph:
     """数据流图信息"""
-    vertices: List[Dict[str, Any]] = None
-    edges: List[Dict[str, Any]] = None
-    metadata: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.vertices is None:
-            self.vertices = []
-        if self.edges is None:
-            self.edges = []
-        if self.metadata is None:
-            self.metadata = {}
+    vertices: List[Dict[str, Any]] = field(default_factory=list)
+    edges: List[Dict[str, Any]] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScopeFileAnalysis:
     """SCOPE 文件分析结果"""
     file_type: ScopeFileType
     file_path: str
     analysis_status: FileAnalysisStatus
     content_summary: str = ""
-    key_findings: List[str] = None
+    key_findings: List[str] = field(default_factory=list)
     parsed_data: Optional[Union[ScopeJobInfo, ScopeJobStatistics, CompilerInfo, DataFlowGraph]] = None
-    analysis_timestamp: Optional[datetime] = None
+    analysis_timestamp: Optional[datetime] = field(default_factory=datetime.now)
     error_message: str = ""
-    
-    def __post_init__(self):
-        if self.key_findings is None:
-            self.key_findings = []
-        if self.analysis_timestamp is None:
-            self.analysis_timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class ScopeAnalysisContext:
     """SCOPE 分析上下文"""
     job_info: Optional[ScopeJobInfo] = None
     job_statistics: Optional[ScopeJobStatistics] = None
     compiler_info: Optional[CompilerInfo] = None
     data_flow_graph: Optional[DataFlowGraph] = None
-    file_analyses: List[ScopeFileAnalysis] = None
+    file_analyses: List[ScopeFileAnalysis] = field(default_factory=list)
     original_script: str = ""
+    _analysis_index: Optional[Dict[ScopeFileType, ScopeFileAnalysis]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _analysis_index_size: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def _get_analysis_index(self) -> Dict[ScopeFileType, ScopeFileAnalysis]:
+        """获取文件分析索引（首次访问或file_analyses被直接修改后重新构建）"""
+        index = self._analysis_index
+        if index is None or self._analysis_index_size != len(self.file_analyses):
+            index = {}
+            for analysis in self.file_analyses:
+                index.setdefault(analysis.file_type, analysis)
+            self._analysis_index = index
+            self._analysis_index_size = len(self.file_analyses)
+        return index
     
-    def __post_init__(self):
-        if self.file_analyses is None:
-            self.file_analyses = []
+    def add_file_analysis(self, analysis: ScopeFileAnalysis):
+        """添加文件分析结果并同步更新索引"""
+        index = self._get_analysis_index()
+        self.file_analyses.append(analysis)
+        index.setdefault(analysis.file_type, analysis)
+        self._analysis_index_size = len(self.file_analyses)
     
     def get_file_analysis(self, file_type: ScopeFileType) -> Optional[ScopeFileAnalysis]:
         """获取特定文件类型的分析结果"""
-        for analysis in self.file_analyses:
-            if analysis.file_type == file_type:
-                return analysis
-        return None
+        return self._get_analysis_index().get(file_type)
     
     def has_data_skew_indicators(self) -> bool:
         """检查是否有数据倾斜指标"""
@@ -2,8 +2,12 @@
 文件解析器模块 - 处理特殊格式的文件解析
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
 # 导入注册表管理
-from .registry import register_parser, get_parser_function, list_available_parsers
+from .registry import register_parser, get_parser_function, list_available_parsers, clear_parser_cache
 
 # 导入基础解析器
 from .basic_parsers import (
@@ -24,25 +28,64 @@ from .scope_script_parser import parse_scope_script
 from .error_parser import parse_error_file
 from .runtime_statistics_parser import parse_scope_runtime_statistics
 
-# 注册所有解析器
-def _register_all_parsers():
-    """注册所有解析器函数"""
-    # 注册基础解析器
-    register_parser("parse_dag_stages", parse_dag_stages)
-    register_parser("parse_performance_metrics", parse_performance_metrics)
-    register_parser("parse_skew_report", parse_skew_report)
-    register_parser("parse_shuffle_stats", parse_shuffle_stats)
+# 并行解析时的最大线程数
+_PARSE_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def _run_parser(parser_name: str, file_path: str) -> str:
+    """按名称查找解析器并解析单个文件"""
+    parser_func = get_parser_function(parser_name)
+    if parser_func is None:
+        return f"未找到解析器: {parser_name}"
+    return parser_func(file_path)
+
+
+def parse_files(files: Dict[str, str], max_workers: int = None) -> Dict[str, str]:
+    """
+    并行解析多个文件
     
-    # 注册Cosmos SCOPE Job解析器
-    register_parser("parse_job_info_xml", parse_job_info_xml)
-    register_parser("parse_job_statistics_xml", parse_job_statistics_xml)
-    register_parser("parse_algebra_xml", parse_algebra_xml)
-    register_parser("parse_data_flow_graph_json", parse_data_flow_graph_json)
-    register_parser("parse_warnings_xml", parse_warnings_xml)
-    register_parser("parse_compile_output_txt", parse_compile_output_txt)
-    register_parser("parse_scope_script", parse_scope_script)
-    register_parser("parse_error_file", parse_error_file)
-    register_parser("parse_scope_runtime_statistics", parse_scope_runtime_statistics)
+    Args:
+        files: 解析器名称到文件路径的映射
+        max_workers: 最大线程数，默认按CPU核数确定
+        
+    Returns:
+        解析器名称到解析结果的映射
+    """
+    if len(files) <= 1:
+        return {name: _run_parser(name, path) for name, path in files.items()}
+    
+    # 解析以文件读取为主，线程池即可重叠I/O且能共享解析结果缓存
+    workers = min(len(files), max_workers or _PARSE_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_run_parser, files.keys(), files.values())
+        return dict(zip(files.keys(), results))
+
+
+# 默认解析器表: 名称 -> 解析函数
+_DEFAULT_PARSERS = {
+    # 基础解析器
+    "parse_dag_stages": parse_dag_stages,
+    "parse_performance_metrics": parse_performance_metrics,
+    "parse_skew_report": parse_skew_report,
+    "parse_shuffle_stats": parse_shuffle_stats,
+    
+    # Cosmos SCOPE Job解析器
+    "parse_job_info_xml": parse_job_info_xml,
+    "parse_job_statistics_xml": parse_job_statistics_xml,
+    "parse_algebra_xml": parse_algebra_xml,
+    "parse_data_flow_graph_json": parse_data_flow_graph_json,
+    "parse_warnings_xml": parse_warnings_xml,
+    "parse_compile_output_txt": parse_compile_output_txt,
+    "parse_scope_script": parse_scope_script,
+    "parse_error_file": parse_error_file,
+    "parse_scope_runtime_statistics": parse_scope_runtime_statistics,
+}
+
+
+def _register_all_parsers():
+    """按默认解析器表注册所有解析器"""
+    for name, parser_func in _DEFAULT_PARSERS.items():
+        register_parser(name, parser_func)
 
 # 初始化时注册所有解析器
 _register_all_parsers()
@@ -53,6 +96,8 @@ __all__ = [
     "register_parser",
     "get_parser_function", 
     "list_available_parsers",
+    "clear_parser_cache",
+    "parse_files",
     
     # 基础解析器
     "parse_dag_stages",
@@ -2,37 +2,37 @@
 代数执行计划解析器 - 解析Algebra.xml文件
 """
 
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET
+except ImportError:  # lxml不可用时回退到标准库
+    import xml.etree.ElementTree as ET
 
 
 def parse_algebra_xml(file_path: str) -> str:
     """解析 Algebra.xml 执行计划文件"""
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
         summary = ["查询执行计划:"]
         
-        # 简单提取算子信息
-        operators = []
-        
-        def extract_operators(element):
-            if element.tag and 'Operator' in element.tag or 'Node' in element.tag:
-                operators.append(element.tag)
-            for child in element:
-                extract_operators(child)
-        
-        extract_operators(root)
+        # 流式提取算子信息，按文档顺序统计，处理完的节点随即释放
+        operator_counts = {}
+        parents = []
+        for event, element in ET.iterparse(file_path, events=("start", "end")):
+            if event == "start":
+                tag = element.tag
+                if 'Operator' in tag or 'Node' in tag:
+                    operator_counts[tag] = operator_counts.get(tag, 0) + 1
+                parents.append(element)
+            else:
+                parents.pop()
+                element.clear()
+                if parents:
+                    parents[-1].remove(element)
         
-        if operators:
-            summary.append(f"- 检测到 {len(operators)} 个算子")
-            operator_counts = {}
-            for op in operators:
-                operator_counts[op] = operator_counts.get(op, 0) + 1
-            
+        if operator_counts:
+            summary.append(f"- 检测到 {sum(operator_counts.values())} 个算子")
             for op, count in operator_counts.items():
                 summary.append(f"  {op}: {count}")
         
         return "\n".join(summary)
     except Exception as e:
-        return f"解析Algebra.xml失败: {str(e)}" 
\ No newline at end of file
+        return f"解析Algebra.xml失败: {str(e)}" 
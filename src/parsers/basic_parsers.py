@@ -3,23 +3,106 @@
 """
 
 import json
+import os
+import re
+from itertools import islice
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson不可用时回退到标准库
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # 未安装ijson时始终整体解析
+    ijson = None
+
+# 同时包含 Stage 与 running/completed 的行
+_DAG_STAGE_LINE_RE = re.compile(r'^(?=.*Stage)(?=.*(?:running|completed)).*$', re.M)
+
+# 分块读取日志文件时每次读取的字符数
+_READ_CHUNK_SIZE = 64 * 1024
+
+# 不小于该大小的JSON文件使用流式解析，小文件整体解析更快
+_STREAMING_JSON_THRESHOLD = 64 * 1024
+
+# 性能指标摘要中输出的字段
+_PERFORMANCE_METRIC_FIELDS = (
+    ('execution_time', '执行时间'),
+    ('cpu_usage', 'CPU使用率'),
+    ('memory_usage', '内存使用'),
+    ('shuffle_size', 'Shuffle数据量')
+)
+
+
+def _should_stream(file_path: str) -> bool:
+    """判断JSON文件是否需要流式解析"""
+    return ijson is not None and os.path.getsize(file_path) >= _STREAMING_JSON_THRESHOLD
+
+
+def _partition_stats(sizes) -> tuple:
+    """单次遍历统计分区大小，返回 (分区数, 最大值, 最小值, 总和)"""
+    count = 0
+    max_size = min_size = None
+    total = 0
+    for size in sizes:
+        if count == 0:
+            max_size = min_size = size
+        elif size > max_size:
+            max_size = size
+        elif size < min_size:
+            min_size = size
+        total += size
+        count += 1
+    return count, max_size, min_size, total
+
+
+def _dag_stage_lines(text: str):
+    """筛选同时包含 Stage 与 running/completed 的行"""
+    return (m.group() for m in _DAG_STAGE_LINE_RE.finditer(text))
+
+
+def _shuffle_lines(text: str):
+    """筛选包含 shuffle（不区分大小写）且包含 bytes/records 的行"""
+    # 不区分大小写的正则在长行上回溯代价高，先用区分大小写的子串判断筛掉大部分行
+    if 'bytes' not in text and 'records' not in text:
+        return ()
+    return (
+        line for line in text.split('\n')
+        if ('bytes' in line or 'records' in line) and 'shuffle' in line.lower()
+    )
+
+
+def _scan_matching_lines(file_path: str, select_lines, limit: int) -> list:
+    """分块读取文本文件，返回前limit个匹配行（已去除首尾空白），达到上限后不再读取"""
+    matched = []
+    pending = ""  # 上一块末尾不完整的行
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while len(matched) < limit:
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if chunk:
+                buffer = pending + chunk
+                cut = buffer.rfind('\n') + 1
+                text, pending = buffer[:cut], buffer[cut:]
+            else:
+                text, pending = pending, ""
+            
+            for line in islice(select_lines(text), limit - len(matched)):
+                matched.append(line.strip())
+            
+            if not chunk:
+                break
+    return matched
 
 
 def parse_dag_stages(file_path: str) -> str:
     """解析DAG stages日志文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         # 简单解析逻辑，实际可以更复杂
-        lines = content.split('\n')
-        parsed_info = []
-        
-        for line in lines:
-            if 'Stage' in line and ('running' in line or 'completed' in line):
-                parsed_info.append(line.strip())
+        parsed_info = _scan_matching_lines(file_path, _dag_stage_lines, 20)  # 限制行数
         
-        return f"DAG Stages 解析结果:\n" + "\n".join(parsed_info[:20])  # 限制行数
+        return f"DAG Stages 解析结果:\n" + "\n".join(parsed_info)
     except Exception as e:
         return f"解析DAG stages文件失败: {str(e)}"
 
@@ -27,20 +110,20 @@ def parse_dag_stages(file_path: str) -> str:
 def parse_performance_metrics(file_path: str) -> str:
     """解析性能指标JSON文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            if _should_stream(file_path):
+                # 只保留需要的顶层字段，不构建完整文档
+                keys = {key for key, _ in _PERFORMANCE_METRIC_FIELDS}
+                data = {k: v for k, v in ijson.kvitems(f, '', use_float=True) if k in keys}
+            else:
+                data = _json_loads(f.read())
         
         summary = []
         summary.append("性能指标摘要:")
         
-        if 'execution_time' in data:
-            summary.append(f"- 执行时间: {data['execution_time']}")
-        if 'cpu_usage' in data:
-            summary.append(f"- CPU使用率: {data['cpu_usage']}")
-        if 'memory_usage' in data:
-            summary.append(f"- 内存使用: {data['memory_usage']}")
-        if 'shuffle_size' in data:
-            summary.append(f"- Shuffle数据量: {data['shuffle_size']}")
+        for key, label in _PERFORMANCE_METRIC_FIELDS:
+            if key in data:
+                summary.append(f"- {label}: {data[key]}")
         
         return "\n".join(summary)
     except Exception as e:
@@ -50,22 +133,33 @@ def parse_performance_metrics(file_path: str) -> str:
 def parse_skew_report(file_path: str) -> str:
     """解析数据倾斜报告"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stats = None
+        
+        if _should_stream(file_path):
+            # 逐个读取分区，不在内存中构建完整的partitions列表
+            with open(file_path, 'rb') as f:
+                partitions = ijson.items(f, 'partitions.item', use_float=True)
+                stats = _partition_stats(p.get('size', 0) for p in partitions)
+            # 未读到分区时无法区分缺少partitions与空列表，回退到整体解析
+            if stats[0] == 0:
+                stats = None
+        
+        if stats is None:
+            with open(file_path, 'rb') as f:
+                data = _json_loads(f.read())
+            if 'partitions' in data:
+                stats = _partition_stats(p.get('size', 0) for p in data['partitions'])
         
         summary = []
         summary.append("数据倾斜分析报告:")
         
-        if 'partitions' in data:
-            partitions = data['partitions']
-            summary.append(f"- 分区数: {len(partitions)}")
+        if stats is not None:
+            partition_count, max_size, min_size, total_size = stats
+            summary.append(f"- 分区数: {partition_count}")
             
             # 找出最大和最小的分区
-            if partitions:
-                sizes = [p.get('size', 0) for p in partitions]
-                max_size = max(sizes)
-                min_size = min(sizes)
-                avg_size = sum(sizes) / len(sizes)
+            if partition_count:
+                avg_size = total_size / partition_count
                 
                 summary.append(f"- 最大分区大小: {max_size}")
                 summary.append(f"- 最小分区大小: {min_size}")
@@ -80,18 +174,10 @@ def parse_skew_report(file_path: str) -> str:
 def parse_shuffle_stats(file_path: str) -> str:
     """解析Shuffle统计日志"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
-        shuffle_ops = []
-        
-        for line in lines:
-            if 'shuffle' in line.lower() and ('bytes' in line or 'records' in line):
-                shuffle_ops.append(line.strip())
+        shuffle_ops = _scan_matching_lines(file_path, _shuffle_lines, 10)  # 显示前10个操作
         
         summary = ["Shuffle操作统计:"]
-        summary.extend(shuffle_ops[:10])  # 显示前10个操作
+        summary.extend(shuffle_ops)
         
         return "\n".join(summary)
     except Exception as e:
@@ -2,14 +2,95 @@
 编译输出解析器 - 解析编译输出文件
 """
 
+import mmap
+import os
+
+# 需要关注的关键字（小写）
+_KEYWORDS = (b'error', b'warning', b'success', b'completed', b'failed')
+
+# 每次小写化并查找关键字的块大小，块边界总落在换行处
+_SCAN_BLOCK_SIZE = 1 << 20
+
+# 关键字出现次数乘以该值超过行数时按逐行方式处理
+_DENSE_HIT_RATIO = 8
+
+
+def _block_end(mm, start: int, size: int) -> int:
+    """返回从start开始的扫描块结束位置（换行符之后）"""
+    end = start + _SCAN_BLOCK_SIZE
+    if end >= size:
+        return size
+    newline = max(mm.rfind(b'\n', start, end), mm.rfind(b'\r', start, end))
+    if newline < 0:
+        # 超长行，延伸到下一个换行
+        following = [i for i in (mm.find(b'\n', end), mm.find(b'\r', end)) if i >= 0]
+        return min(following) + 1 if following else size
+    return newline + 1
+
+
+def _sparse_keyword_lines(block: bytes, lowered: bytes) -> list:
+    """在小写化的块中查找关键字，返回命中行（按出现顺序解码）"""
+    has_cr = b'\r' in block
+    line_spans = {}  # 行起点 -> 行终点
+    for keyword in _KEYWORDS:
+        pos = lowered.find(keyword)
+        while pos >= 0:
+            line_start = lowered.rfind(b'\n', 0, pos) + 1
+            line_end = lowered.find(b'\n', pos)
+            if line_end < 0:
+                line_end = len(lowered)
+            if has_cr:
+                line_start = max(line_start, lowered.rfind(b'\r', line_start, pos) + 1)
+                cr = lowered.find(b'\r', pos, line_end)
+                if cr >= 0:
+                    line_end = cr
+            line_spans[line_start] = line_end
+            pos = lowered.find(keyword, line_end)
+    return [block[line_start:line_spans[line_start]].decode('utf-8') for line_start in sorted(line_spans)]
+
+
+def _dense_keyword_lines(block: bytes) -> list:
+    """解码整个块后逐行判断，返回包含关键字的行"""
+    text = block.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    matched = []
+    for line in text.split('\n'):
+        line_lower = line.lower()
+        if ('error' in line_lower or 'warning' in line_lower or 'success' in line_lower
+                or 'completed' in line_lower or 'failed' in line_lower):
+            matched.append(line)
+    return matched
+
+
+def _read_keyword_lines(file_path: str) -> list:
+    """映射文件后按块查找关键字，只解码包含关键字的行（兼容\n、\r\n和\r换行）"""
+    lines = []
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return lines
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = _block_end(mm, start, size)
+                block = mm[start:end]
+                # bytes.lower只转换ASCII，长度不变，位置可直接对应原始内容
+                lowered = block.lower()
+                
+                # 关键字密集时逐行判断更快，稀疏时只定位命中的行
+                hits = sum(lowered.count(keyword) for keyword in _KEYWORDS)
+                if hits * _DENSE_HIT_RATIO > block.count(b'\n') + block.count(b'\r'):
+                    lines.extend(_dense_keyword_lines(block))
+                else:
+                    lines.extend(_sparse_keyword_lines(block, lowered))
+                start = end
+    return lines
+
 
 def parse_compile_output_txt(file_path: str) -> str:
     """解析编译输出文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
         summary = ["编译输出摘要:"]
         
         error_count = 0
@@ -17,7 +98,7 @@ def parse_compile_output_txt(file_path: str) -> str:
         
         important_lines = []
         
-        for line in lines:
+        for line in _read_keyword_lines(file_path):
             line_lower = line.lower()
             if 'error' in line_lower:
                 error_count += 1
@@ -3,13 +3,20 @@
 """
 
 import json
+from collections import Counter
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson不可用时回退到标准库
+    _json_loads = json.loads
 
 
 def parse_data_flow_graph_json(file_path: str) -> str:
     """解析 __DataMapDfg__.json 数据流图文件"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = _json_loads(f.read())
         
         summary = ["数据流图信息:"]
         
@@ -17,11 +24,8 @@ def parse_data_flow_graph_json(file_path: str) -> str:
             vertices = data['vertices']
             summary.append(f"- 顶点数: {len(vertices)}")
             
-            # 统计顶点类型
-            vertex_types = {}
-            for vertex in vertices:
-                vertex_type = vertex.get('type', 'Unknown')
-                vertex_types[vertex_type] = vertex_types.get(vertex_type, 0) + 1
+            # 统计顶点类型（按首次出现顺序）
+            vertex_types = Counter(vertex.get('type', 'Unknown') for vertex in vertices)
             
             summary.append("- 顶点类型分布:")
             for v_type, count in vertex_types.items():
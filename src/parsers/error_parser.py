@@ -3,20 +3,44 @@
 """
 
 import json
+from itertools import chain
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson不可用时回退到标准库
+    _json_loads = json.loads
+
+# 判断文件格式时预读的字符数
+_PEEK_SIZE = 4096
+
+# JSON文本可能的首字符（含标准库json接受的NaN/Infinity）
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
 
 
 def parse_error_file(file_path: str) -> str:
     """解析错误文件 - 支持JSON和文本格式"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if not content.strip():
-            return "错误文件为空 - 作业执行成功"
+            # 预读开头跳过空白，根据首个字符判断是否可能为JSON
+            head = f.read(_PEEK_SIZE).lstrip()
+            while not head:
+                chunk = f.read(_PEEK_SIZE)
+                if not chunk:
+                    return "错误文件为空 - 作业执行成功"
+                head = chunk.lstrip()
+            
+            if head[0] not in _JSON_START_CHARS:
+                # 明显不是JSON，逐行流式统计，不把整个文件读入内存
+                head_lines = head.split('\n')
+                first_partial = head_lines.pop()
+                return _summarize_text_error(chain(head_lines, (first_partial + f.readline(),), f))
+            
+            content = head + f.read()
         
         # 尝试解析为JSON格式
         try:
-            error_data = json.loads(content)
+            error_data = _json_loads(content)
             return _parse_json_error(error_data)
         except (json.JSONDecodeError, ValueError):
             # 如果不是JSON格式，使用原来的文本解析方式
@@ -86,34 +110,48 @@ def _parse_json_error(error_data: dict) -> str:
 
 def _parse_text_error(content: str) -> str:
     """解析文本格式的错误信息（原有逻辑）"""
+    return _summarize_text_error(content.split('\n'))
+
+
+def _summarize_text_error(lines) -> str:
+    """逐行统计文本错误信息，只保留前几行详情"""
     summary = ["错误信息分析:"]
     
-    lines = content.split('\n')
-    error_lines = [line.strip() for line in lines if line.strip()]
-    
-    summary.append(f"- 错误行数: {len(error_lines)}")
+    error_line_count = 0
+    detail_lines = []
+    error_types = set()
     
-    # 错误类型分析
-    error_types = []
-    for line in error_lines:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        error_line_count += 1
+        if len(detail_lines) < 5:
+            detail_lines.append(line)
+        
+        # 错误类型分析，四类都已出现后不再判断
+        if len(error_types) == 4:
+            continue
         line_lower = line.lower()
         if 'outofmemory' in line_lower or 'memory' in line_lower:
-            error_types.append("内存错误")
+            error_types.add("内存错误")
         elif 'timeout' in line_lower:
-            error_types.append("超时错误")
+            error_types.add("超时错误")
         elif 'skew' in line_lower or 'imbalance' in line_lower:
-            error_types.append("数据倾斜错误")
+            error_types.add("数据倾斜错误")
         elif 'shuffle' in line_lower:
-            error_types.append("Shuffle错误")
+            error_types.add("Shuffle错误")
+    
+    summary.append(f"- 错误行数: {error_line_count}")
     
     if error_types:
         summary.append("- 错误类型:")
-        for error_type in set(error_types):
+        for error_type in error_types:
             summary.append(f"  - {error_type}")
     
     # 显示前几行错误信息
     summary.append("- 错误详情:")
-    for line in error_lines[:5]:
+    for line in detail_lines:
         summary.append(f"  {line}")
     
     return "\n".join(summary)
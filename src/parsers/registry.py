@@ -2,21 +2,47 @@
 解析器注册表管理
 """
 
+import functools
+import os
+import sys
 from typing import Dict, Callable, Optional
 
 # 解析器注册表
 _PARSER_REGISTRY: Dict[str, Callable] = {}
 
+# 每个解析器缓存的解析结果数
+_PARSE_CACHE_SIZE = 128
+
+
+def _with_file_cache(parser_func: Callable) -> Callable:
+    """按 (路径, 修改时间, 文件大小) 缓存解析结果，文件变化后自动失效"""
+    @functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def _cached(file_path, mtime_ns, size):
+        return parser_func(file_path)
+    
+    @functools.wraps(parser_func)
+    def wrapper(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # 文件不可访问时交给解析器返回原有的错误信息
+            return parser_func(file_path)
+        return _cached(file_path, st.st_mtime_ns, st.st_size)
+    
+    wrapper.cache_clear = _cached.cache_clear
+    return wrapper
+
 
 def register_parser(name: str, parser_func: Callable):
     """
-    注册新的解析器
+    注册新的解析器，解析结果按文件版本缓存
     
     Args:
         name: 解析器名称
         parser_func: 解析器函数
     """
-    _PARSER_REGISTRY[name] = parser_func
+    # 驻留名称，查找时可直接比较字符串对象
+    _PARSER_REGISTRY[sys.intern(name)] = _with_file_cache(parser_func)
 
 
 def get_parser_function(parser_name: str) -> Optional[Callable]:
@@ -34,4 +60,10 @@ def get_parser_function(parser_name: str) -> Optional[Callable]:
 
 def list_available_parsers() -> list:
     """列出所有可用的解析器"""
-    return list(_PARSER_REGISTRY.keys()) 
\ No newline at end of file
+    return list(_PARSER_REGISTRY.keys()) 
+
+
+def clear_parser_cache():
+    """清空所有已注册解析器的结果缓存"""
+    for parser_func in _PARSER_REGISTRY.values():
+        parser_func.cache_clear()
@@ -4,6 +4,62 @@ SCOPE脚本解析器 - 解析SCOPE脚本文件
 
 import re
 
+# SQL操作关键字，四类关键字首字母不同，一次扫描即可分别计数
+_SQL_OPERATION_RE = re.compile(
+    r'\b(?:(?P<select>SELECT)|(?P<total_joins>JOIN)|(?P<group_by>GROUP\s+BY)|(?P<partition_by>PARTITION\s+BY))\b',
+    re.IGNORECASE
+)
+
+# 其余统计用到的正则，模块加载时编译一次
+_MODULE_RE = re.compile(r'MODULE\s+"[^"]+"', re.IGNORECASE)
+_REFERENCE_RE = re.compile(r'\[PIN\]REFERENCE\s+"[^"]+"', re.IGNORECASE)
+_DLL_REFERENCE_RE = re.compile(r'\[PIN\]REFERENCE\s+"[^"]*\.dll"', re.IGNORECASE)
+_DECLARE_RE = re.compile(r'#DECLARE\s+\w+', re.IGNORECASE)
+_VIEW_RE = re.compile(r'VIEW\s+"[^"]+\.view"', re.IGNORECASE)
+_CS_BLOCK_RE = re.compile(r'#CS.*?#ENDCS', re.DOTALL)
+_PROCESSOR_RE = re.compile(r'USING\s+(\w+);')
+_CROSS_APPLY_RE = re.compile(r'\bCROSS\s+APPLY\b', re.IGNORECASE)
+_PROCESS_RE = re.compile(r'\bPROCESS\b.*?\bUSING\b', re.IGNORECASE)
+_UNION_RE = re.compile(r'\bUNION\s+(ALL\s+)?', re.IGNORECASE)
+_DISTINCT_RE = re.compile(r'\bDISTINCT\b', re.IGNORECASE)
+_LIST_CALL_RE = re.compile(r'LIST\(', re.IGNORECASE)
+
+_JOIN_TYPE_PATTERNS = tuple(
+    (join_type, re.compile(pattern, re.IGNORECASE)) for join_type, pattern in (
+        ('INNER JOIN', r'\bINNER\s+JOIN\b'),
+        ('LEFT JOIN', r'\bLEFT\s+JOIN\b'),
+        ('RIGHT JOIN', r'\bRIGHT\s+JOIN\b'),
+        ('FULL JOIN', r'\bFULL\s+JOIN\b'),
+        ('CROSS JOIN', r'\bCROSS\s+JOIN\b'),
+        ('BROADCASTRIGHT JOIN', r'\bBROADCASTRIGHT\s+JOIN\b'),
+        ('ANTISEMIJOIN', r'\bANTISEMIJOIN\b'),
+        ('SEMIJOIN', r'\bSEMIJOIN\b'),
+        ('普通JOIN', r'(?<!INNER\s)(?<!LEFT\s)(?<!RIGHT\s)(?<!FULL\s)(?<!CROSS\s)(?<!BROADCASTRIGHT\s)(?<!ANTI)(?<!SEMI)\bJOIN\b')
+    )
+)
+
+_AGG_FUNCTION_PATTERNS = tuple(
+    (func, re.compile(pattern, re.IGNORECASE)) for func, pattern in (
+        ('COUNT', r'\bCOUNT\s*\('),
+        ('COUNTIF', r'\bCOUNTIF\s*\('),
+        ('SUM', r'\bSUM\s*\('),
+        ('AVG', r'\bAVG\s*\('),
+        ('MAX', r'\bMAX\s*\('),
+        ('MIN', r'\bMIN\s*\('),
+        ('LIST', r'\bLIST\s*\('),
+        ('DISTINCT', r'\bDISTINCT\b')
+    )
+)
+
+_SET_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), description) for pattern, description in (
+        (r'SET\s+@@Buckets\s*=\s*(\d+)', 'Buckets设置'),
+        (r'SET\s+@@IgnoreMaxPartitionsThreshold\s*=\s*(\w+)', 'IgnoreMaxPartitionsThreshold'),
+        (r'SET\s+@@FeaturePreviews\s*=\s*"([^"]+)"', 'FeaturePreviews'),
+        (r'SET\s+@@(\w+)', '其他SET配置')
+    )
+)
+
 
 def parse_scope_script(file_path: str) -> str:
     """解析 SCOPE 脚本文件"""
@@ -13,8 +69,7 @@ def parse_scope_script(file_path: str) -> str:
         
         summary = ["SCOPE脚本分析:"]
         
-        lines = content.split('\n')
-        total_lines = len(lines)
+        total_lines = content.count('\n') + 1
         
         # 基本统计
         summary.append(f"- 脚本行数: {total_lines}")
@@ -27,11 +82,11 @@ def parse_scope_script(file_path: str) -> str:
             summary.append(f"- DLL文件: {', '.join(dll_references[:3])}{'...' if len(dll_references) > 3 else ''}")
         
         # 分析变量声明
-        declare_count = _count_pattern(content, r'#DECLARE\s+\w+')
+        declare_count = _count_pattern(content, _DECLARE_RE)
         summary.append(f"- 变量声明: {declare_count}")
         
         # 分析VIEW使用
-        view_count = _count_pattern(content, r'VIEW\s+"[^"]+\.view"')
+        view_count = _count_pattern(content, _VIEW_RE)
         summary.append(f"- VIEW使用: {view_count}")
         
         # 分析SQL操作
@@ -97,12 +152,11 @@ def parse_scope_script(file_path: str) -> str:
 
 def _analyze_modules_and_references(content: str) -> tuple:
     """分析模块和引用"""
-    module_count = _count_pattern(content, r'MODULE\s+"[^"]+"')
-    reference_count = _count_pattern(content, r'\[PIN\]REFERENCE\s+"[^"]+"')
+    module_count = _count_pattern(content, _MODULE_RE)
+    reference_count = _count_pattern(content, _REFERENCE_RE)
     
     # 提取DLL引用
-    dll_pattern = r'\[PIN\]REFERENCE\s+"[^"]*\.dll"'
-    dll_matches = re.findall(dll_pattern, content, re.IGNORECASE)
+    dll_matches = _DLL_REFERENCE_RE.findall(content)
     dll_references = [match.split('/')[-1].replace('"', '') for match in dll_matches]
     
     return module_count, reference_count, dll_references
@@ -110,26 +164,16 @@ def _analyze_modules_and_references(content: str) -> tuple:
 
 def _analyze_sql_operations(content: str) -> dict:
     """分析SQL操作"""
-    return {
-        'select': _count_pattern(content, r'\bSELECT\b'),
-        'total_joins': _count_pattern(content, r'\bJOIN\b'),
-        'group_by': _count_pattern(content, r'\bGROUP\s+BY\b'),
-        'partition_by': _count_pattern(content, r'\bPARTITION\s+BY\b')
-    }
+    sql_stats = {'select': 0, 'total_joins': 0, 'group_by': 0, 'partition_by': 0}
+    for match in _SQL_OPERATION_RE.finditer(content):
+        sql_stats[match.lastgroup] += 1
+    return sql_stats
 
 
 def _analyze_join_types(content: str) -> dict:
     """分析JOIN类型"""
     join_types = {
-        'INNER JOIN': _count_pattern(content, r'\bINNER\s+JOIN\b'),
-        'LEFT JOIN': _count_pattern(content, r'\bLEFT\s+JOIN\b'),
-        'RIGHT JOIN': _count_pattern(content, r'\bRIGHT\s+JOIN\b'),
-        'FULL JOIN': _count_pattern(content, r'\bFULL\s+JOIN\b'),
-        'CROSS JOIN': _count_pattern(content, r'\bCROSS\s+JOIN\b'),
-        'BROADCASTRIGHT JOIN': _count_pattern(content, r'\bBROADCASTRIGHT\s+JOIN\b'),
-        'ANTISEMIJOIN': _count_pattern(content, r'\bANTISEMIJOIN\b'),
-        'SEMIJOIN': _count_pattern(content, r'\bSEMIJOIN\b'),
-        '普通JOIN': _count_pattern(content, r'(?<!INNER\s)(?<!LEFT\s)(?<!RIGHT\s)(?<!FULL\s)(?<!CROSS\s)(?<!BROADCASTRIGHT\s)(?<!ANTI)(?<!SEMI)\bJOIN\b')
+        join_type: _count_pattern(content, pattern) for join_type, pattern in _JOIN_TYPE_PATTERNS
     }
     
     return {k: v for k, v in join_types.items() if v > 0}
@@ -138,14 +182,7 @@ def _analyze_join_types(content: str) -> dict:
 def _analyze_aggregation_functions(content: str) -> dict:
     """分析聚合函数"""
     agg_functions = {
-        'COUNT': _count_pattern(content, r'\bCOUNT\s*\('),
-        'COUNTIF': _count_pattern(content, r'\bCOUNTIF\s*\('),
-        'SUM': _count_pattern(content, r'\bSUM\s*\('),
-        'AVG': _count_pattern(content, r'\bAVG\s*\('),
-        'MAX': _count_pattern(content, r'\bMAX\s*\('),
-        'MIN': _count_pattern(content, r'\bMIN\s*\('),
-        'LIST': _count_pattern(content, r'\bLIST\s*\('),
-        'DISTINCT': _count_pattern(content, r'\bDISTINCT\b')
+        func: _count_pattern(content, pattern) for func, pattern in _AGG_FUNCTION_PATTERNS
     }
     
     return {k: v for k, v in agg_functions.items() if v > 0}
@@ -153,11 +190,10 @@ def _analyze_aggregation_functions(content: str) -> dict:
 
 def _analyze_udf_and_processors(content: str) -> dict:
     """分析UDF和自定义处理器"""
-    cs_blocks = len(re.findall(r'#CS.*?#ENDCS', content, re.DOTALL))
+    cs_blocks = len(_CS_BLOCK_RE.findall(content))
     
     # 查找自定义处理器
-    processor_pattern = r'USING\s+(\w+);'
-    processors = re.findall(processor_pattern, content)
+    processors = _PROCESSOR_RE.findall(content)
     processors = [p for p in processors if p not in ['Outputters', 'Privacy']]  # 排除系统处理器
     
     return {
@@ -168,16 +204,9 @@ def _analyze_udf_and_processors(content: str) -> dict:
 
 def _analyze_set_configurations(content: str) -> list:
     """分析SET配置"""
-    set_patterns = [
-        (r'SET\s+@@Buckets\s*=\s*(\d+)', 'Buckets设置'),
-        (r'SET\s+@@IgnoreMaxPartitionsThreshold\s*=\s*(\w+)', 'IgnoreMaxPartitionsThreshold'),
-        (r'SET\s+@@FeaturePreviews\s*=\s*"([^"]+)"', 'FeaturePreviews'),
-        (r'SET\s+@@(\w+)', '其他SET配置')
-    ]
-    
     configs = []
-    for pattern, description in set_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
+    for pattern, description in _SET_PATTERNS:
+        matches = pattern.findall(content)
         if matches:
             if 'Buckets' in description:
                 configs.append(f"{description}: {matches[0]}")
@@ -194,11 +223,11 @@ def _analyze_complex_operations(content: str) -> list:
     complex_ops = []
     
     # CROSS APPLY操作
-    if _count_pattern(content, r'\bCROSS\s+APPLY\b') > 0:
+    if _count_pattern(content, _CROSS_APPLY_RE) > 0:
         complex_ops.append("CROSS APPLY操作")
     
     # PROCESS操作
-    process_count = _count_pattern(content, r'\bPROCESS\b.*?\bUSING\b')
+    process_count = _count_pattern(content, _PROCESS_RE)
     if process_count > 0:
         complex_ops.append(f"PROCESS操作: {process_count}")
     
@@ -208,7 +237,7 @@ def _analyze_complex_operations(content: str) -> list:
         complex_ops.append("复杂嵌套查询")
     
     # UNION操作
-    union_count = _count_pattern(content, r'\bUNION\s+(ALL\s+)?')
+    union_count = _count_pattern(content, _UNION_RE)
     if union_count > 0:
         complex_ops.append(f"UNION操作: {union_count}")
     
@@ -241,7 +270,7 @@ def _detect_performance_issues(content: str, sql_stats: dict, join_details: dict
         issues.append("使用多个自定义处理器，可能影响并行度")
     
     # 复杂查询问题
-    if _count_pattern(content, r'\bDISTINCT\b') > 3:
+    if _count_pattern(content, _DISTINCT_RE) > 3:
         issues.append("多次使用DISTINCT，可能需要大量内存")
     
     # 数据倾斜风险
@@ -275,12 +304,12 @@ def _generate_recommendations(sql_stats: dict, join_details: dict, udf_stats: di
         recommendations.append("考虑设置@@Buckets参数优化并行度")
     
     # 内存优化建议
-    if _count_pattern(' '.join(set_configs), r'LIST\(') > 2:
+    if _count_pattern(' '.join(set_configs), _LIST_CALL_RE) > 2:
         recommendations.append("注意LIST函数的内存使用，避免过大集合")
     
     return recommendations
 
 
-def _count_pattern(content: str, pattern: str) -> int:
-    """统计正则表达式匹配次数"""
-    return len(re.findall(pattern, content, re.IGNORECASE)) 
\ No newline at end of file
+def _count_pattern(content: str, pattern: "re.Pattern") -> int:
+    """统计预编译正则表达式的匹配次数"""
+    return len(pattern.findall(content)) 
\ No newline at end of file
@@ -2,7 +2,6 @@
 文件请求Prompt模板
 """
 
-from langchain.prompts import PromptTemplate
 from typing import Dict, Any
 
 class FileRequestPromptTemplate:
@@ -36,5 +35,5 @@ class FileRequestPromptTemplate:
 """
     
     def format(self, **kwargs) -> str:
-        return self.template.format(**kwargs)
+        return self.template.format_map(kwargs)
 
@@ -2,8 +2,10 @@
 主要思维链Prompt模板
 """
 
-from langchain.prompts import PromptTemplate
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
 
 
 class MainThinkPromptTemplate:
@@ -11,15 +13,25 @@ class MainThinkPromptTemplate:
     
     def __init__(self):
         self.template = self._build_template()
-        self.prompt = PromptTemplate(
-            input_variables=[
-                "user_question",
-                "context_info", 
-                "retrieved_experience",
-                "files_content"
-            ],
-            template=self.template
-        )
+        self._prompt = None
+    
+    @property
+    def prompt(self) -> "PromptTemplate":
+        """供LLMChain使用的PromptTemplate，首次访问时创建"""
+        if self._prompt is None:
+            # 延迟导入langchain，仅格式化Prompt时无需加载
+            from langchain.prompts import PromptTemplate
+            
+            self._prompt = PromptTemplate(
+                input_variables=[
+                    "user_question",
+                    "context_info", 
+                    "retrieved_experience",
+                    "files_content"
+                ],
+                template=self.template
+            )
+        return self._prompt
     
     def _build_template(self) -> str:
         """构建完整的思维链模板"""
@@ -121,7 +133,8 @@ class MainThinkPromptTemplate:
 
     def format_prompt(self, **kwargs) -> str:
         """格式化Prompt"""
-        return self.prompt.format(**kwargs)
+        # 直接使用str.format_map，避免PromptTemplate每次调用的校验开销
+        return self.template.format_map(kwargs)
     
     def get_template(self) -> str:
         """获取模板字符串"""
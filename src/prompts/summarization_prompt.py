@@ -2,7 +2,6 @@
 总结Prompt模板
 """
 
-from langchain.prompts import PromptTemplate
 from typing import Dict, Any
 
 class SummarizationPromptTemplate:
@@ -40,4 +39,4 @@ class SummarizationPromptTemplate:
 """
     
     def format(self, **kwargs) -> str:
-        return self.template.format(**kwargs) 
\ No newline at end of file
+        return self.template.format_map(kwargs) 
\ No newline at end of file
@@ -2,16 +2,60 @@
 上下文增强器 - 改善文件选择和分析质量
 """
 
+import os
+import re
 from typing import Dict, Any, List, Optional
 from ..models.analysis_models import ProblemType, ContextInfo, ThinkStep
 
 
+# 文件扩展名到文件类型描述的映射
+_FILE_TYPE_BY_SUFFIX = {
+    ".txt": "脚本文件",
+    ".log": "日志文件",
+    ".json": "配置文件"
+}
+
+# 文件内容关键模式（不区分大小写，无需复制整个内容做小写转换）
+_JOIN_RE = re.compile('join', re.IGNORECASE)
+_SKEW_INFO_RE = re.compile('倾斜|skew|不均', re.IGNORECASE)
+_SHUFFLE_RE = re.compile('shuffle', re.IGNORECASE)
+_STAGE_RE = re.compile('stage', re.IGNORECASE)
+
+
+def _weighted_patterns(weights):
+    """将 (关键词, 权重) 编译为 (不区分大小写的模式, 权重)"""
+    return tuple((re.compile(re.escape(keyword), re.IGNORECASE), weight)
+                 for keyword, weight in weights)
+
+
+# 各问题类型的文件相关性关键词及权重
+_RELEVANCE_KEYWORD_WEIGHTS = {
+    ProblemType.DATA_SKEW: _weighted_patterns((
+        ('join', 0.3), ('partition', 0.2), ('skew', 0.3), ('倾斜', 0.3),
+        ('hot', 0.2), ('热点', 0.2), ('distribute', 0.1)
+    )),
+    ProblemType.EXCESSIVE_SHUFFLE: _weighted_patterns((
+        ('shuffle', 0.4), ('stage', 0.2), ('network', 0.1), ('broadcast', 0.2),
+        ('reduce', 0.1), ('partition', 0.1)
+    )),
+    ProblemType.OTHER: _weighted_patterns((
+        ('error', 0.3), ('exception', 0.3), ('config', 0.2), ('performance', 0.2)
+    ))
+}
+
+
 class ContextEnhancer:
     """上下文增强器类"""
     
     def __init__(self):
         """初始化上下文增强器"""
         self.enhancement_rules = self._init_enhancement_rules()
+        # 规则是静态的，预先渲染各问题类型的列表文本
+        self._rendered_rules = {
+            problem_type: self._render_rule(rule)
+            for problem_type, rule in self.enhancement_rules.items()
+        }
+        self._empty_rendered_rule = self._render_rule({})
     
     def _init_enhancement_rules(self) -> Dict[str, Dict[str, Any]]:
         """初始化增强规则 - 基于实际Cosmos SCOPE Job文件结构"""
@@ -54,6 +98,13 @@ class ContextEnhancer:
             }
         }
     
+    def _render_rule(self, rule: Dict[str, Any]) -> Dict[str, str]:
+        """将增强规则中的列表渲染为文本"""
+        return {
+            key: self._format_list(rule.get(key, []))
+            for key in ("key_concepts", "analysis_focus", "priority_files", "common_solutions")
+        }
+    
     def enhance_context_for_file_selection(self, 
                                          problem_type: ProblemType, 
                                          user_input: str, 
@@ -71,7 +122,7 @@ class ContextEnhancer:
         Returns:
             增强后的上下文信息
         """
-        enhancement_rule = self.enhancement_rules.get(problem_type.value, {})
+        rendered = self._rendered_rules.get(problem_type.value, self._empty_rendered_rule)
         
         enhanced_context = f"""
 【问题分析上下文】
@@ -79,17 +130,17 @@ class ContextEnhancer:
 用户输入: {user_input}
 
 【关键概念】
-{self._format_list(enhancement_rule.get('key_concepts', []))}
+{rendered['key_concepts']}
 
 【分析重点】
-{self._format_list(enhancement_rule.get('analysis_focus', []))}
+{rendered['analysis_focus']}
 
 【已有分析结果】
 {previous_analysis if previous_analysis else '暂无'}
 
 【文件选择指导】
 基于{problem_type.value}问题的特点，优先考虑以下类型的文件：
-{self._format_list(enhancement_rule.get('priority_files', []))}
+{rendered['priority_files']}
 
 【关键点检查】
 - 是否涉及数据处理的核心逻辑？
@@ -99,7 +150,7 @@ class ContextEnhancer:
 
 【解决方案线索】
 常见解决方案包括：
-{self._format_list(enhancement_rule.get('common_solutions', []))}
+{rendered['common_solutions']}
 """
         
         return enhanced_context
@@ -164,7 +215,7 @@ class ContextEnhancer:
         """格式化列表为字符串"""
         if not items:
             return "暂无"
-        return "\n".join([f"{prefix}{item}" for item in items])
+        return prefix + ("\n" + prefix).join(items)
     
     def _calculate_analysis_progress(self, context_info: ContextInfo) -> float:
         """计算分析进度"""
@@ -268,26 +319,21 @@ class ContextEnhancer:
         
         for file_name, content in file_contents.items():
             # 文件类型分析
-            if file_name.endswith('.txt'):
-                analysis["file_types"].append("脚本文件")
-            elif file_name.endswith('.log'):
-                analysis["file_types"].append("日志文件")
-            elif file_name.endswith('.json'):
-                analysis["file_types"].append("配置文件")
+            file_type = _FILE_TYPE_BY_SUFFIX.get(os.path.splitext(file_name)[1])
+            if file_type:
+                analysis["file_types"].append(file_type)
             
             # 关键模式识别
-            content_lower = content.lower()
-            
             if problem_type == ProblemType.DATA_SKEW:
-                if 'join' in content_lower:
+                if _JOIN_RE.search(content):
                     analysis["key_patterns"].append(f"{file_name}中发现Join操作")
-                if any(word in content_lower for word in ['倾斜', 'skew', '不均']):
+                if _SKEW_INFO_RE.search(content):
                     analysis["key_patterns"].append(f"{file_name}中发现数据倾斜相关信息")
             
             elif problem_type == ProblemType.EXCESSIVE_SHUFFLE:
-                if 'shuffle' in content_lower:
+                if _SHUFFLE_RE.search(content):
                     analysis["key_patterns"].append(f"{file_name}中发现Shuffle操作")
-                if 'stage' in content_lower:
+                if _STAGE_RE.search(content):
                     analysis["key_patterns"].append(f"{file_name}中发现Stage信息")
             
             # 计算相关性得分
@@ -303,28 +349,11 @@ class ContextEnhancer:
         if not problem_type or not content:
             return 0.5
         
-        content_lower = content.lower()
         score = 0.0
         
         # 基于问题类型的关键词权重
-        keyword_weights = {
-            ProblemType.DATA_SKEW: {
-                'join': 0.3, 'partition': 0.2, 'skew': 0.3, '倾斜': 0.3,
-                'hot': 0.2, '热点': 0.2, 'distribute': 0.1
-            },
-            ProblemType.EXCESSIVE_SHUFFLE: {
-                'shuffle': 0.4, 'stage': 0.2, 'network': 0.1, 'broadcast': 0.2,
-                'reduce': 0.1, 'partition': 0.1
-            },
-            ProblemType.OTHER: {
-                'error': 0.3, 'exception': 0.3, 'config': 0.2, 'performance': 0.2
-            }
-        }
-        
-        weights = keyword_weights.get(problem_type, {})
-        
-        for keyword, weight in weights.items():
-            if keyword in content_lower:
+        for pattern, weight in _RELEVANCE_KEYWORD_WEIGHTS.get(problem_type, ()):
+            if pattern.search(content):
                 score += weight
         
         return min(score, 1.0)
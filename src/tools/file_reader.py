@@ -2,8 +2,11 @@
 文件读取工具 - 支持普通文件读取和特殊格式解析
 """
 
+import functools
 import os
+import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from langchain.tools import Tool
 from ..parsers import get_parser_function
@@ -21,8 +24,17 @@ class FileReaderTool:
             parser_mapping: 文件到解析器的映射
         """
         self.base_path = base_path
-        self.parser_mapping = parser_mapping or {}
+        # 驻留解析器名称，与注册表中的键为同一对象，查找时无需逐字符比较
+        self.parser_mapping = {
+            filename: sys.intern(parser_name)
+            for filename, parser_name in (parser_mapping or {}).items()
+        }
         self.read_history = []  # 读取历史记录
+        
+        # 普通文件读取结果缓存：(文件名, 修改时间, 文件大小) -> 内容，文件变化后自动失效
+        self._cached_read = functools.lru_cache(maxsize=64)(
+            lambda filename, mtime_ns, size: self._read_plain_file(filename)
+        )
     
     def read_files(self, filenames: List[str]) -> str:
         """
@@ -36,9 +48,16 @@ class FileReaderTool:
         """
         contents = []
         
-        for filename in filenames:
+        if len(filenames) > 1:
+            # 多个文件并行读取/解析，结果仍按传入顺序合并
+            with ThreadPoolExecutor(max_workers=min(len(filenames), 8)) as executor:
+                futures = [executor.submit(self.read_single_file, filename) for filename in filenames]
+        else:
+            futures = None
+        
+        for i, filename in enumerate(filenames):
             try:
-                content = self.read_single_file(filename)
+                content = futures[i].result() if futures else self.read_single_file(filename)
                 if content:
                     contents.append(f"=== 文件: {filename} ===\n{content}\n")
                     self.read_history.append(filename)
@@ -70,7 +89,17 @@ class FileReaderTool:
             if parser_func:
                 return parser_func(file_path)
         
-        # 普通文件读取
+        # 普通文件读取，文件未变化时复用上次的结果
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            return f"读取文件 {filename} 时发生错误: {str(e)}"
+        return self._cached_read(filename, st.st_mtime_ns, st.st_size)
+    
+    def _read_plain_file(self, filename: str) -> str:
+        """按文本读取普通文件，过大时截断"""
+        file_path = os.path.join(self.base_path, filename)
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -173,7 +202,7 @@ class SmartFileReader:
         """
         # 获取文件推荐
         recommendations = self.recommendation_tool.recommend_files(
-            problem_type, context, current_analysis
+            problem_type, context, current_analysis, top_k=max_files
         )
         
         if not recommendations:
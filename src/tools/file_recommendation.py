@@ -2,10 +2,35 @@
 文件推荐工具 - 智能推荐需要查看的文件
 """
 
+import hashlib
+import heapq
+import re
+import sys
 import time
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.analysis_models import ProblemType, FileRecommendation, ContextInfo
 
+# Cosmos SCOPE Job 文件内容映射与解析函数映射，统一定义在 config/settings.py
+from config.settings import DEFAULT_FILE_MAPPING, DEFAULT_PARSER_MAPPING
+
+
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """将关键词列表编译为不区分大小写的多选正则"""
+    # 长关键词优先，避免被其前缀抢先匹配
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered), re.IGNORECASE)
+
+
+# 推荐结果缓存的最大条目数
+_RECOMMENDATION_CACHE_SIZE = 256
+
+# 问题类型相关的得分加成关键词
+_PROBLEM_TYPE_BOOST_PATTERNS = {
+    ProblemType.DATA_SKEW: _compile_keywords(["join", "倾斜", "分布"]),
+    ProblemType.EXCESSIVE_SHUFFLE: _compile_keywords(["shuffle", "stage", "重分区"])
+}
+
 
 class FileRecommendationTool:
     """文件推荐工具类"""
@@ -54,9 +79,25 @@ class FileRecommendationTool:
             "警告信息": ["warning", "警告", "Warnings", "潜在问题"],
             "诊断数据": ["diagnostic", "诊断", "监控", "统计", "Statistics"]
         }
+        
+        # 预编译每种信息类型的关键词匹配，并缓存去重后的小写关键词用于计数
+        self._info_patterns = {
+            info_type: _compile_keywords(keywords)
+            for info_type, keywords in self.keyword_mapping.items()
+        }
+        self._lower_keywords = {
+            info_type: frozenset(sys.intern(keyword.lower()) for keyword in keywords)
+            for info_type, keywords in self.keyword_mapping.items()
+        }
+        
+        # 文件描述与信息类型的关键词得分只取决于两者本身：(小写描述, 信息类型) -> 得分
+        self._type_score_cache: Dict[Tuple[str, str], float] = {}
+        
+        # 推荐结果缓存：(问题类型, 已读文件集合, 分析内容摘要) -> 推荐列表
+        self._recommendation_cache: "OrderedDict[tuple, Tuple[FileRecommendation, ...]]" = OrderedDict()
     
     def recommend_files(self, problem_type: ProblemType, context: ContextInfo, 
-                       current_analysis: str) -> List[FileRecommendation]:
+                       current_analysis: str, top_k: Optional[int] = None) -> List[FileRecommendation]:
         """
         基于问题类型、上下文和当前分析状态推荐文件
         
@@ -64,42 +105,80 @@ class FileRecommendationTool:
             problem_type: 问题类型
             context: 上下文信息
             current_analysis: 当前分析内容
+            top_k: 只返回得分最高的前K个推荐，None表示返回全部
             
         Returns:
             推荐文件列表，按相关性得分排序
         """
+        # 相同输入在多轮迭代中会重复出现，直接复用之前的结果
+        cache_key = (
+            problem_type,
+            frozenset(context.files_read),
+            hashlib.blake2b(current_analysis.encode("utf-8"), digest_size=16).digest(),
+            top_k
+        )
+        cached = self._recommendation_cache.get(cache_key)
+        if cached is not None:
+            self._recommendation_cache.move_to_end(cache_key)
+            return list(cached)
+        
+        recommendations = self._compute_recommendations(
+            problem_type, context, current_analysis, top_k
+        )
+        
+        self._recommendation_cache[cache_key] = tuple(recommendations)
+        if len(self._recommendation_cache) > _RECOMMENDATION_CACHE_SIZE:
+            self._recommendation_cache.popitem(last=False)
+        
+        return recommendations
+    
+    def _compute_recommendations(self, problem_type: ProblemType, context: ContextInfo,
+                                 current_analysis: str,
+                                 top_k: Optional[int] = None) -> List[FileRecommendation]:
+        """计算推荐文件列表（不使用缓存）"""
         # 1. 识别缺失的信息类型
         missing_info_types = self._identify_missing_information(
             problem_type, context.user_input, current_analysis
         )
         
-        recommendations = []
+        # 2. 基于文件内容描述匹配需求，只计算得分
+        candidates = self._score_candidates(context.files_read, missing_info_types, problem_type)
         
-        # 2. 基于文件内容描述匹配需求
+        # 3. 按相关性得分排序（得分相同时保持映射顺序），只取前K个
+        if top_k is None:
+            ranked = sorted(candidates, key=lambda c: c[0], reverse=True)
+        else:
+            ranked = heapq.nlargest(top_k, candidates, key=lambda c: c[0])
+        
+        # 4. 只为最终入选的文件生成推荐对象和推荐原因
+        return [
+            FileRecommendation(
+                file_name=file_name,
+                content_description=content_desc,
+                relevance_score=relevance_score,
+                reason=self._generate_recommendation_reason(
+                    content_desc, missing_info_types, problem_type
+                ),
+                requires_parser=file_name in self.parser_functions,
+                parser_function=self.parser_functions.get(file_name)
+            )
+            for relevance_score, file_name, content_desc in ranked
+        ]
+    
+    def _score_candidates(self, files_read: List[str], missing_info_types: List[str],
+                          problem_type: ProblemType):
+        """逐个产出超过相关性阈值的未读取文件 (相关性得分, 文件名, 内容描述)"""
         for file_name, content_desc in self.file_content_mapping.items():
             # 跳过已读取的文件
-            if file_name in context.files_read:
+            if file_name in files_read:
                 continue
-                
+            
             relevance_score = self._calculate_content_relevance(
                 content_desc, missing_info_types, problem_type
             )
             
             if relevance_score > 0.3:  # 设置相关性阈值
-                recommendation = FileRecommendation(
-                    file_name=file_name,
-                    content_description=content_desc,
-                    relevance_score=relevance_score,
-                    reason=self._generate_recommendation_reason(
-                        content_desc, missing_info_types, problem_type
-                    ),
-                    requires_parser=file_name in self.parser_functions,
-                    parser_function=self.parser_functions.get(file_name)
-                )
-                recommendations.append(recommendation)
-        
-        # 3. 按相关性得分排序
-        return sorted(recommendations, key=lambda x: x.relevance_score, reverse=True)
+                yield relevance_score, file_name, content_desc
     
     def _identify_missing_information(self, problem_type: ProblemType, 
                                     user_input: str, current_analysis: str) -> List[str]:
@@ -120,12 +199,11 @@ class FileRecommendationTool:
         """检查特定类型的信息是否已包含在分析中"""
         if not analysis:
             return False
-            
-        keywords = self.keyword_mapping.get(info_type, [])
-        analysis_lower = analysis.lower()
+        
+        pattern = self._info_patterns.get(info_type)
         
         # 至少要匹配一个关键词才认为信息存在
-        return any(keyword.lower() in analysis_lower for keyword in keywords)
+        return pattern is not None and pattern.search(analysis) is not None
     
     def _calculate_content_relevance(self, content_desc: str, missing_info: List[str], 
                                    problem_type: ProblemType) -> float:
@@ -138,22 +216,21 @@ class FileRecommendationTool:
         
         # 基于缺失信息类型计算得分
         for missing_type in missing_info:
-            keywords = self.keyword_mapping.get(missing_type, [])
-            
-            # 关键词匹配得分
-            matches = sum(1 for keyword in keywords if keyword.lower() in content_lower)
-            if matches > 0:
-                # 每个匹配的关键词贡献0.2分，最高1.0分
+            type_score = self._type_score_cache.get((content_lower, missing_type))
+            if type_score is None:
+                keywords = self._lower_keywords.get(missing_type, ())
+                
+                # 关键词匹配得分：每个匹配的关键词贡献0.2分，最高1.0分
+                matches = sum(1 for keyword in keywords if keyword in content_lower)
                 type_score = min(matches * 0.2, 1.0)
-                score += type_score
+                self._type_score_cache[(content_lower, missing_type)] = type_score
+            
+            score += type_score
         
         # 根据问题类型给予权重加成
-        if problem_type == ProblemType.DATA_SKEW:
-            if any(keyword in content_lower for keyword in ["join", "倾斜", "分布"]):
-                score *= 1.2
-        elif problem_type == ProblemType.EXCESSIVE_SHUFFLE:
-            if any(keyword in content_lower for keyword in ["shuffle", "stage", "重分区"]):
-                score *= 1.2
+        boost_pattern = _PROBLEM_TYPE_BOOST_PATTERNS.get(problem_type)
+        if boost_pattern is not None and boost_pattern.search(content_desc):
+            score *= 1.2
         
         return min(score, 1.0)  # 限制最大得分为1.0
     
@@ -234,73 +311,3 @@ class FileRecommendationTool:
         
         return min(base_score, 1.0)
 
-
-# Cosmos SCOPE Job 文件内容映射配置
-DEFAULT_FILE_MAPPING = {
-    # 原始脚本和命令
-    "scope.script": "用户提交的原始SCOPE脚本代码",
-    "NebulaCommandLine.txt": "作业实际提交运行时的命令行参数",
-    
-    # 代码生成相关文件
-    "__ScopeCodeGen__.dll": "编译后的动态链接库，包含作业的实际执行代码",
-    "__ScopeCodeGen__.dll.cs": "生成的C#源代码，包含编译时生成的所有执行逻辑",
-    "__ScopeCodeGenCompileOutput__.txt": "编译阶段生成C#代码时的输出信息",
-    "__ScopeCodeGenCompileOptions__.txt": "编译选项文件，包含编译器使用的具体编译参数",
-    "__CompilerTimers.xml": "编译阶段各个步骤所花费时间的信息",
-    
-    # 作业执行信息文件
-    "JobInfo.xml": "作业的基本信息，如Job ID、提交时间、作业类型、资源需求等",
-    "JobStatistics.xml": "作业执行完成后的统计信息，包括每个阶段执行时长、数据量统计等",
-    "diagnosticsjson": "诊断信息，以JSON格式提供作业执行期间的问题或状态",
-    "Error": "作业执行过程中的错误详细信息",
-    
-    # 数据映射与执行计划文件
-    "Algebra.xml": "以XML格式记录作业执行的查询计划，展现底层算子逻辑与依赖关系",
-    "ScopeVertexDef.xml": "定义作业中的各个计算节点（Vertex）的详细配置信息和参数",
-    "__DataMapDfg__.json": "作业数据流图的JSON表示，提供数据流关系、阶段间的数据依赖关系",
-    
-    # 警告和运行状态信息
-    "__Warnings__.xml": "编译或运行阶段的警告信息，反映可能潜在影响性能的点",
-    "__ScopeRuntimeStatistics__.xml": "作业执行期间运行时的详细统计数据",
-    "__ScopeInternalInfo__.xml": "内部状态信息，用于进一步的故障诊断和分析",
-    "__SStreamInfo__.xml": "Stream流的元数据信息，用于跟踪数据流之间的传输细节",
-    
-    # 性能分析
-    "profile": "作业性能分析数据，可用来深入分析节点级别的资源占用情况"
-}
-
-# Cosmos SCOPE Job 解析函数映射
-DEFAULT_PARSER_MAPPING = {
-    # XML文件解析器
-    "JobInfo.xml": "parse_job_info_xml",
-    "JobStatistics.xml": "parse_job_statistics_xml",
-    "Algebra.xml": "parse_algebra_xml",
-    "ScopeVertexDef.xml": "parse_vertex_def_xml",
-    "__CompilerTimers.xml": "parse_compiler_timers_xml",
-    "__Warnings__.xml": "parse_warnings_xml",
-    "__ScopeRuntimeStatistics__.xml": "parse_runtime_statistics_xml",
-    "__ScopeInternalInfo__.xml": "parse_internal_info_xml",
-    "__SStreamInfo__.xml": "parse_stream_info_xml",
-    
-    # JSON文件解析器
-    "__DataMapDfg__.json": "parse_data_flow_graph_json",
-    "diagnosticsjson": "parse_diagnostics_json",
-    
-    # 文本文件解析器
-    "__ScopeCodeGenCompileOutput__.txt": "parse_compile_output_txt",
-    "__ScopeCodeGenCompileOptions__.txt": "parse_compile_options_txt",
-    "NebulaCommandLine.txt": "parse_command_line_txt",
-    
-    # C#代码文件解析器
-    "__ScopeCodeGen__.dll.cs": "parse_csharp_code",
-    
-    # SCOPE脚本解析器
-    "request.script": "parse_scope_script",
-    "scope.script": "parse_scope_script",
-    
-    # 性能分析文件解析器
-    "profile": "parse_profile_data",
-    
-    # 错误文件解析器
-    "Error": "parse_error_file"
-} 
\ No newline at end of file
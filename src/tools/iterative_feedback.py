@@ -73,11 +73,11 @@ class IterativeFeedbackProcessor:
             )
             
             next_recommendations = self.recommendation_tool.recommend_files(
-                problem_type, context, updated_analysis
+                problem_type, context, updated_analysis, top_k=3
             )
             
             # 过滤掉已读取的文件
-            read_files = [item["file_name"] for item in self.analysis_history]
+            read_files = {item["file_name"] for item in self.analysis_history}
             filtered_recommendations = [
                 rec for rec in next_recommendations 
                 if rec.file_name not in read_files
@@ -2,8 +2,33 @@
 文本处理工具函数
 """
 
+import functools
 import re
-from typing import List, Set
+from typing import List, Set, Tuple
+
+
+# 预编译的正则表达式
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\s\u4e00-\u9fff.,!?;:()[\]{}"\'-]')
+# 纯ASCII文本（如日志）中需替换为空格的字符，用str.translate代替正则替换
+_SPECIAL_ASCII_TABLE = {
+    code: ' ' for code in range(128) if _SPECIAL_CHAR_RE.match(chr(code))
+}
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_THINK_STEP_RE = re.compile(
+    r'\[THINK[_\s]*(\d+)\](.*?)(?=\[THINK[_\s]*\d+\]|$)',
+    re.DOTALL | re.IGNORECASE
+)
+
+# 常见停用词
+_STOP_WORDS = frozenset({
+    'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are', 'was', 'were',
+    'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'to', 'of', 'in', 'for', 'with', 'by',
+    '的', '是', '在', '和', '有', '了', '我', '你', '他', '她', '我们', '你们', '他们',
+    '这', '那', '也', '都', '很', '就', '但', '不', '没', '要', '会', '可以'
+})
 
 
 def extract_keywords(text: str, min_length: int = 3) -> List[str]:
@@ -20,38 +45,26 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
     if not text:
         return []
     
+    # 缓存中保存元组，每次返回新的列表，调用方可以自由修改
+    return list(_extract_keywords_cached(text, min_length))
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_keywords_cached(text: str, min_length: int) -> Tuple[str, ...]:
+    """提取关键词，相同输入直接复用结果"""
     # 清理文本
     cleaned_text = clean_text(text)
     
-    # 分词
-    words = re.findall(r'\b\w+\b', cleaned_text.lower())
-    
-    # 过滤常见停用词
-    stop_words = {
-        'the', 'is', 'at', 'which', 'on', 'and', 'a', 'an', 'as', 'are', 'was', 'were',
-        'been', 'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'must', 'can', 'to', 'of', 'in', 'for', 'with', 'by',
-        '的', '是', '在', '和', '有', '了', '我', '你', '他', '她', '我们', '你们', '他们',
-        '这', '那', '也', '都', '很', '就', '但', '不', '没', '要', '会', '可以'
-    }
-    
-    # 过滤关键词
-    keywords = [
-        word for word in words 
-        if len(word) >= min_length and word not in stop_words
-    ]
+    # 分词后先用dict.fromkeys去重并保持顺序，再只对不重复的词过滤停用词和过短的词
+    unique_words = dict.fromkeys(_WORD_RE.findall(cleaned_text.lower()))
     
-    # 去重并保持顺序
-    seen = set()
-    unique_keywords = []
-    for keyword in keywords:
-        if keyword not in seen:
-            seen.add(keyword)
-            unique_keywords.append(keyword)
-    
-    return unique_keywords
+    return tuple(
+        word for word in unique_words
+        if len(word) >= min_length and word not in _STOP_WORDS
+    )
 
 
+@functools.lru_cache(maxsize=256)
 def clean_text(text: str) -> str:
     """
     清理文本，去除特殊字符和多余空格
@@ -66,13 +79,16 @@ def clean_text(text: str) -> str:
         return ""
     
     # 去除HTML标签
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
     
     # 去除特殊字符，保留中文、英文、数字和基本标点
-    text = re.sub(r'[^\w\s\u4e00-\u9fff.,!?;:()[\]{}"\'-]', ' ', text)
+    if text.isascii():
+        text = text.translate(_SPECIAL_ASCII_TABLE)
+    else:
+        text = _SPECIAL_CHAR_RE.sub(' ', text)
     
     # 处理多个空格
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     # 去除首尾空格
     text = text.strip()
@@ -96,17 +112,27 @@ def highlight_keywords(text: str, keywords: List[str],
     if not text or not keywords:
         return text
     
-    highlighted_text = text
+    pattern, replacements = _compile_highlighter(tuple(keywords), highlight_format)
     
-    for keyword in keywords:
-        # 使用正则表达式进行不区分大小写的替换
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        highlighted_text = pattern.sub(
-            highlight_format.format(keyword), 
-            highlighted_text
-        )
+    return pattern.sub(lambda m: replacements[m.lastindex - 1], text)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_highlighter(keywords: Tuple[str, ...], 
+                         highlight_format: str) -> Tuple["re.Pattern", Tuple[str, ...]]:
+    """
+    将关键词合并为一个不区分大小写的正则，只需扫描一遍文本
     
-    return highlighted_text
+    Returns:
+        (正则, 各捕获组对应的高亮文本)
+    """
+    # 长关键词优先，避免被其前缀抢先匹配
+    ordered = sorted(keywords, key=len, reverse=True)
+    pattern = re.compile(
+        "|".join(f"({re.escape(keyword)})" for keyword in ordered),
+        re.IGNORECASE
+    )
+    return pattern, tuple(highlight_format.format(keyword) for keyword in ordered)
 
 
 def extract_think_steps(text: str) -> dict:
@@ -121,10 +147,7 @@ def extract_think_steps(text: str) -> dict:
     """
     think_steps = {}
     
-    # THINK步骤模式
-    think_pattern = r'\[THINK[_\s]*(\d+)\](.*?)(?=\[THINK[_\s]*\d+\]|$)'
-    
-    matches = re.findall(think_pattern, text, re.DOTALL | re.IGNORECASE)
+    matches = _THINK_STEP_RE.findall(text)
     
     for step_num, content in matches:
         step_name = f"THINK_{step_num}"
@@ -178,23 +201,25 @@ def split_long_text(text: str, max_length: int = 2000,
     Returns:
         文本片段列表
     """
-    if len(text) <= max_length:
+    text_length = len(text)
+    if text_length <= max_length:
         return [text]
     
     chunks = []
     start = 0
+    min_break_offset = max_length // 2
     
-    while start < len(text):
+    while start < text_length:
         end = start + max_length
         
         # 如果不是最后一个片段，尝试在句号处断开
-        if end < len(text):
-            # 向前查找句号
+        if end < text_length:
+            # 向前查找句号；换行符只需在最后一个句号之后查找
             last_period = text.rfind('.', start, end)
-            last_newline = text.rfind('\n', start, end)
+            last_newline = text.rfind('\n', max(last_period + 1, start), end)
             break_point = max(last_period, last_newline)
             
-            if break_point > start + max_length // 2:
+            if break_point > start + min_break_offset:
                 end = break_point + 1
         
         chunk = text[start:end].strip()